@@ -1,7 +1,61 @@
+"""Anchor-based patcher for components/InventoryPanel.tsx.
 
+Patches are located by start/end anchor patterns instead of line numbers, the
+target is streamed line by line and the result is written through a temp file
+in the same directory followed by an atomic rename.
+
+    python fix_inventory_panel.py                 # patch components/InventoryPanel.tsx
+    python fix_inventory_panel.py --dry-run       # print matched range and unified diff
+    python fix_inventory_panel.py path/to/File.tsx
+    python fix_inventory_panel.py --dry-run 'components/InventoryPanel.tsx*'
+    python fix_inventory_panel.py --manifest targets.txt --jobs 8
+
+Several targets (globs or a manifest with one path per line) are patched in
+parallel over a process pool with a per-file status line and total timings.
+
+Target and patch hashes are kept in .patch-manifest.json: targets whose size
+and mtime still match an entry that already has the patch are skipped after a
+single stat call, and a block that already equals the replacement is never
+rewritten. Use --force to rescan everything.
+
+Before writing, the targets of a run are snapshotted into the content-addressed
+store in .snapshots (see snapshot_store.py) instead of being copied to .bak
+files; the snapshot id is printed and restores the run's inputs:
+
+    python snapshot_store.py restore <snapshot id>
+
+With --cost, the replaced block and its replacement are run through the
+render-cost analyzer (render_cost.py) and the per-render cost delta is printed
+for each target; --max-cost-increase refuses to write targets whose estimated
+cost grows by more than the given percentage.
+"""
+
+import argparse
+import difflib
+import glob
+import hashlib
+import json
+import math
 import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import render_cost
+from snapshot_store import DEFAULT_STORE, SnapshotError, SnapshotStore
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TARGET = os.path.join(ROOT_DIR, 'components', 'InventoryPanel.tsx')
 
-file_path = '/Users/arasdemiray/.gemini/antigravity/scratch/cine-brain-pro/components/InventoryPanel.tsx'
+DEFAULT_STATE = os.path.join(ROOT_DIR, '.patch-manifest.json')
+
+DIFF_CONTEXT = 3
 
 new_code = r"""                                {CATEGORIES.filter(cat => cat.id === activeTab).map(cat => {
                                     // 1. Filter Items
@@ -253,29 +307,500 @@ new_code = r"""                                {CATEGORIES.filter(cat => cat.id
                                     );
                                 })}"""
 
-with open(file_path, 'r') as f:
-    lines = f.readlines()
+class PatchError(Exception):
+    """Raised when a patch cannot be applied safely to a target."""
+
+
+@dataclass(frozen=True)
+class Patch:
+    """A block replacement located by anchors.
+
+    `start` must match exactly one line of the target. The block ends at the
+    first following line that matches `end` with the same indentation as the
+    start line, so nested closers deeper in the block are not mistaken for it.
+    `replacement` is re-indented to the indentation of the matched start line.
+    """
+
+    name: str
+    start: str
+    end: str
+    replacement: str
+
+    def start_re(self):
+        return re.compile(self.start)
+
+    def end_re(self):
+        return re.compile(self.end)
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        for part in (self.name, self.start, self.end, self.replacement):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def render(self, indent: str, newline: str = '\n') -> List[str]:
+        lines = self.replacement.splitlines()
+        base = _common_indent(lines)
+        return [
+            (indent + line[len(base):] if line.strip() else '') + newline
+            for line in lines
+        ]
+
+
+@dataclass
+class PatchResult:
+    path: str
+    patch: str
+    status: str
+    start_line: Optional[int] = None
+    end_line: Optional[int] = None
+    diff: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    source_hash: Optional[str] = None
+    output_hash: Optional[str] = None
+    render_cost: Optional[dict] = None
+
+    def describe(self) -> str:
+        if self.error:
+            return f"{self.path}: {self.patch} {self.status}: {self.error}"
+        if self.start_line is None:
+            return f"{self.path}: {self.patch} {self.status}"
+        return (f"{self.path}: {self.patch} {self.status} "
+                f"(lines {self.start_line}-{self.end_line})")
+
+
+def _indent_of(line: str) -> str:
+    return line[:len(line) - len(line.lstrip(' \t'))]
+
+
+def _common_indent(lines: List[str]) -> str:
+    indents = [_indent_of(line) for line in lines if line.strip()]
+    if not indents:
+        return ''
+    return os.path.commonprefix(indents)
+
+
+def _newline_of(line: str) -> str:
+    if line.endswith('\r\n'):
+        return '\r\n'
+    return '\n'
+
+
+def _display_path(path: str) -> str:
+    path = os.path.abspath(path)
+    if path.startswith(ROOT_DIR + os.sep):
+        return os.path.relpath(path, ROOT_DIR)
+    return path
+
+
+def _shift_hunks(diff_lines: List[str], offset: int) -> List[str]:
+    """Move hunk headers of a diff over an excerpt to absolute line numbers."""
+    header = re.compile(r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@')
+    shifted = []
+    for line in diff_lines:
+        m = header.match(line)
+        if m:
+            line = header.sub(
+                f"@@ -{int(m.group(1)) + offset}{m.group(2) or ''} "
+                f"+{int(m.group(3)) + offset}{m.group(4) or ''} @@",
+                line,
+            )
+        shifted.append(line)
+    return shifted
+
+
+def _discard(tmp) -> None:
+    if tmp:
+        tmp.close()
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+
+
+def cost_increase(delta: dict) -> float:
+    """Relative cost growth in percent at the largest catalog size of a delta."""
+    row = delta[max(delta, key=int)]
+    if not row['old']:
+        return math.inf if row['new'] else 0.0
+    return 100 * row['delta'] / row['old']
+
+
+def apply_patch(path: str, patch: Patch, dry_run: bool = False,
+                cost_sizes: Optional[Sequence[int]] = None,
+                max_cost_increase: Optional[float] = None) -> PatchResult:
+    """Stream `path` through `patch`, replacing the anchored block.
+
+    Memory use is bounded by the size of the replaced block (kept only for the
+    dry-run diff), not by the size of the file. In dry-run mode nothing is
+    written; otherwise the output goes to a temp file that atomically replaces
+    the target once the whole file has been scanned without errors. A block
+    that already equals the replacement is reported as `already-applied` and
+    the target is left untouched.
+
+    With `cost_sizes`, the old and new block are compared with the render-cost
+    analyzer; a growth above `max_cost_increase` percent leaves the target
+    untouched with status `cost-regression`.
+    """
+    start_re = patch.start_re()
+    end_re = patch.end_re()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = None
+    if not dry_run:
+        tmp = tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', newline='', dir=directory,
+            prefix=f".{os.path.basename(path)}.", suffix='.tmp', delete=False,
+        )
+
+    result = PatchResult(path=path, patch=patch.name, status='no-match')
+    context = deque(maxlen=DIFF_CONTEXT)
+    before: List[str] = []
+    old_block: List[str] = []
+    new_block: List[str] = []
+    after: List[str] = []
+    indent = None
+    source_hash = hashlib.sha256()
+    output_hash = hashlib.sha256()
+
+    def emit(lines):
+        for out in lines:
+            output_hash.update(out.encode('utf-8'))
+        if tmp:
+            tmp.writelines(lines)
+
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as src:
+            for lineno, line in enumerate(src, start=1):
+                source_hash.update(line.encode('utf-8'))
+                if indent is not None and result.end_line is None:
+                    # Inside the anchored block: drop it until the end anchor.
+                    old_block.append(line)
+                    if end_re.search(line) and _indent_of(line) == indent:
+                        result.end_line = lineno
+                        new_block = patch.render(indent, _newline_of(line))
+                        emit(new_block)
+                    continue
+
+                if start_re.search(line):
+                    if indent is not None:
+                        raise PatchError(
+                            f"{path}: start anchor for {patch.name!r} matches again "
+                            f"at line {lineno} (first at {result.start_line})"
+                        )
+                    indent = _indent_of(line)
+                    result.start_line = lineno
+                    before = list(context)
+                    old_block.append(line)
+                    continue
+
+                if result.end_line is not None and len(after) < DIFF_CONTEXT:
+                    after.append(line)
+                context.append(line)
+                emit([line])
+
+        if indent is not None and result.end_line is None:
+            raise PatchError(
+                f"{path}: end anchor for {patch.name!r} not found after "
+                f"line {result.start_line}"
+            )
+
+        result.source_hash = source_hash.hexdigest()
+        if result.start_line is None:
+            _discard(tmp)
+            return result
+
+        if old_block == new_block:
+            _discard(tmp)
+            result.status = 'already-applied'
+            result.output_hash = result.source_hash
+            return result
+
+        diff = difflib.unified_diff(
+            before + old_block + after,
+            before + new_block + after,
+            fromfile=f"a/{_display_path(path)}",
+            tofile=f"b/{_display_path(path)}",
+            n=DIFF_CONTEXT,
+        )
+        result.diff = _shift_hunks(list(diff), result.start_line - len(before) - 1)
+
+        if cost_sizes:
+            result.render_cost = render_cost.cost_delta(''.join(old_block), ''.join(new_block), cost_sizes)
+            if max_cost_increase is not None and cost_increase(result.render_cost) > max_cost_increase:
+                _discard(tmp)
+                result.status = 'cost-regression'
+                result.error = (f"estimated render cost grows {cost_increase(result.render_cost):.1f}% "
+                                f"(limit {max_cost_increase:g}%)")
+                return result
+
+        if dry_run:
+            result.status = 'dry-run'
+            return result
+
+        tmp.flush()
+        os.fsync(tmp.fileno())
+        tmp.close()
+        shutil.copymode(path, tmp.name)
+        os.replace(tmp.name, path)
+        result.status = 'applied'
+        result.output_hash = output_hash.hexdigest()
+        return result
+    except BaseException:
+        _discard(tmp)
+        raise
+
+
+CATALOG_FILTER_PATCH = Patch(
+    name='catalog-filter',
+    start=r'^\s*\{CATEGORIES\.filter\(cat => cat\.id === activeTab\)\.map\(cat => \{\s*$',
+    end=r'^\s*\}\)\}\s*$',
+    replacement=new_code,
+)
+
+PATCHES = {patch.name: patch for patch in [CATALOG_FILTER_PATCH]}
+
+
+class PatchManifest:
+    """Persisted content hashes of targets and the patches recorded for them.
+
+    Entries are keyed by target path and hold the size, mtime and sha256 seen
+    after the last run plus, per patch name, the patch digest and outcome.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'PatchManifest':
+        manifest = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as exc:
+            print(f"warning: ignoring unreadable manifest {path}: {exc}", file=sys.stderr)
+            return manifest
+        if data.get('version') == cls.VERSION:
+            manifest.entries = data.get('targets', {})
+        return manifest
+
+    def lookup(self, path: str, patch: Patch) -> Optional[str]:
+        """Return the recorded outcome if `path` is unchanged since it was recorded."""
+        entry = self.entries.get(_display_path(path))
+        if not entry:
+            return None
+        record = entry['patches'].get(patch.name)
+        if not record or record['digest'] != patch.digest():
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry['size'] or st.st_mtime_ns != entry['mtime_ns']:
+            return None
+        return record['status']
+
+    def record(self, result: PatchResult, patch: Patch) -> None:
+        if result.status not in ('applied', 'already-applied', 'no-match'):
+            return
+        try:
+            st = os.stat(result.path)
+        except OSError:
+            return
+        key = _display_path(result.path)
+        sha = result.output_hash or result.source_hash
+        entry = self.entries.get(key)
+        if not entry or entry['sha256'] != sha:
+            # Content changed: outcomes recorded for the old content are void.
+            entry = {'patches': {}}
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=sha)
+        status = 'no-match' if result.status == 'no-match' else 'up-to-date'
+        entry['patches'][patch.name] = {'digest': patch.digest(), 'status': status}
+        self.entries[key] = entry
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=directory, prefix='.patch-manifest.',
+            suffix='.tmp', delete=False,
+        ) as tmp:
+            json.dump({'version': self.VERSION, 'targets': self.entries}, tmp,
+                      indent=2, sort_keys=True)
+        os.replace(tmp.name, self.path)
+
+
+def expand_targets(patterns: List[str], manifest: Optional[str] = None) -> List[str]:
+    """Resolve glob patterns and manifest entries to a sorted list of files.
+
+    Manifest lines are paths or globs relative to the manifest's directory;
+    blank lines and `#` comments are ignored.
+    """
+    patterns = list(patterns)
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    patterns.append(os.path.join(base, line))
+
+    targets = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [m for m in glob.glob(pattern, recursive=True) if os.path.isfile(m)]
+        else:
+            # Explicit paths are kept even if missing so they report as failed.
+            matches = [pattern]
+        targets.update(os.path.abspath(m) for m in matches)
+    return sorted(targets)
+
+
+def _run_one(path: str, patch_name: str, dry_run: bool,
+             cost_sizes: Optional[Sequence[int]] = None,
+             max_cost_increase: Optional[float] = None) -> PatchResult:
+    started = time.perf_counter()
+    try:
+        result = apply_patch(path, PATCHES[patch_name], dry_run=dry_run,
+                             cost_sizes=cost_sizes, max_cost_increase=max_cost_increase)
+    except (OSError, UnicodeDecodeError, PatchError) as exc:
+        result = PatchResult(path=path, patch=patch_name, status='failed', error=str(exc))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_batch(targets: List[str], patch_name: str, dry_run: bool = False,
+              jobs: Optional[int] = None,
+              state: Optional[PatchManifest] = None,
+              force: bool = False,
+              store: Optional[SnapshotStore] = None,
+              cost_sizes: Optional[Sequence[int]] = None,
+              max_cost_increase: Optional[float] = None) -> tuple:
+    """Apply one patch to many targets over a process pool, in target order.
+
+    With a `state` manifest, targets it reports as unchanged are skipped
+    without being opened (unless `force`), and outcomes of real (non dry-run)
+    runs are recorded. With a `store`, the targets that will be opened are
+    snapshotted first. `cost_sizes` and `max_cost_increase` are passed to
+    apply_patch. Returns the results and the snapshot (or None).
+    """
+    patch = PATCHES[patch_name]
+    results = {}
+    pending = []
+    for path in targets:
+        cached = state.lookup(path, patch) if state and not force else None
+        if cached:
+            results[path] = PatchResult(path=path, patch=patch_name, status=cached)
+        else:
+            pending.append(path)
+
+    snapshot = None
+    if store and pending and not dry_run:
+        snapshot = store.snapshot(pending, label=f"before {patch_name}")
+
+    options = (patch_name, dry_run, cost_sizes, max_cost_increase)
+    if len(pending) <= 1 or jobs == 1:
+        ran = [_run_one(path, *options) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            ran = list(pool.map(_run_one, pending, *([option] * len(pending) for option in options)))
+
+    for result in ran:
+        results[result.path] = result
+        if state and not dry_run:
+            state.record(result, patch)
+    return [results[path] for path in targets], snapshot
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('targets', nargs='*',
+                        help='files or glob patterns to patch (default: components/InventoryPanel.tsx)')
+    parser.add_argument('--manifest',
+                        help='file listing targets, one path or glob per line')
+    parser.add_argument('--patch', choices=sorted(PATCHES), default=CATALOG_FILTER_PATCH.name,
+                        help='patch to apply')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report the matched range and a unified diff without writing')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='worker processes for batch runs (default: CPU count)')
+    parser.add_argument('--state', default=DEFAULT_STATE,
+                        help='content-hash manifest of targets (default: .patch-manifest.json)')
+    parser.add_argument('--force', action='store_true',
+                        help='rescan every target even if the manifest says it is up to date')
+    parser.add_argument('--snapshots', default=DEFAULT_STORE,
+                        help='snapshot store taken before writing (default: .snapshots)')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='do not snapshot targets before writing')
+    parser.add_argument('--cost', action='store_true',
+                        help='print the estimated per-render cost delta of the replaced block')
+    parser.add_argument('--cost-sizes', type=render_cost.parse_sizes, default=list(render_cost.DEFAULT_SIZES),
+                        help='catalog sizes for --cost, comma separated (default: 100,1000,10000)')
+    parser.add_argument('--max-cost-increase', type=float, metavar='PCT',
+                        help='do not write targets whose estimated render cost grows by more than PCT%% '
+                             '(implies --cost)')
+    args = parser.parse_args(argv)
+
+    patterns = args.targets or ([] if args.manifest else [DEFAULT_TARGET])
+    try:
+        targets = expand_targets(patterns, args.manifest)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if not targets:
+        print("error: no targets matched", file=sys.stderr)
+        return 1
+
+    state = PatchManifest.load(args.state)
+    store = None if args.no_snapshot else SnapshotStore(args.snapshots)
+
+    started = time.perf_counter()
+    try:
+        results, snapshot = run_batch(targets, args.patch, dry_run=args.dry_run, jobs=args.jobs,
+                                      state=state, force=args.force, store=store,
+                                      cost_sizes=args.cost_sizes if args.cost or args.max_cost_increase is not None
+                                      else None,
+                                      max_cost_increase=args.max_cost_increase)
+    except (OSError, SnapshotError) as exc:
+        print(f"error: snapshot failed, nothing was written: {exc}", file=sys.stderr)
+        return 1
+    total = time.perf_counter() - started
+
+    if not args.dry_run:
+        try:
+            state.save()
+        except OSError as exc:
+            print(f"warning: could not save manifest {args.state}: {exc}", file=sys.stderr)
 
-# Lines are 0-indexed in list
-# We want to replace lines 983 to 1243 (1-based)
-# 1-based start: 983 => 0-based index: 982
-# 1-based end: 1243 => 0-based index: 1243 (exclusive in slice? no, want to include 1243)
-# In python slice [start:end], end is exclusive.
-# So we want [0:982] + [new_code] + [1243:]
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        line = result.describe()
+        if len(results) > 1:
+            line = f"{line} [{result.elapsed * 1000:.1f} ms]"
+        print(line, file=sys.stderr if result.status in ('failed', 'cost-regression') else sys.stdout)
+        if result.render_cost:
+            print(f"    render cost: {render_cost.format_delta(result.render_cost)}")
+        if args.dry_run:
+            sys.stdout.writelines(result.diff)
 
-# Verify lines using content check if possible, otherwise trust line numbers from recent view_file
-print(f"Total lines: {len(lines)}")
-print(f"Line 983 (index 982): {lines[982]}")
-print(f"Line 1243 (index 1242): {lines[1242]}")
+    if len(results) > 1:
+        summary = ', '.join(f"{n} {status}" for status, n in sorted(counts.items()))
+        print(f"{len(results)} targets in {total:.2f}s: {summary}")
+    if snapshot and counts.get('applied'):
+        print(f"snapshot {snapshot.id} holds the previous contents "
+              f"(python snapshot_store.py restore {snapshot.id})")
 
-# Slice
-before = lines[:982]
-after = lines[1243:] # 1243 is correct index for line 1244 (1-based)
+    if counts.get('failed') or counts.get('cost-regression'):
+        return 1
+    if not any(counts.get(s) for s in ('applied', 'dry-run', 'already-applied', 'up-to-date')):
+        return 2
+    return 0
 
-# Write back
-with open(file_path, 'w') as f:
-    f.writelines(before)
-    f.write(new_code + '\n')
-    f.writelines(after)
 
-print("Successfully patched file.")
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,541 @@
+"""Static hot-path analyzer for TSX components.
+
+Scans component source for work that runs on every render and scales with the
+catalog, and estimates its cost per render as a function of catalog size N:
+
+- array passes (`filter`, `map`, `forEach`, `find`, `reduce`, ...) over
+  catalog-sized collections, multiplied by the loops they sit in, e.g. a
+  `catalog.filter(...).sort(...)` inside `CATEGORIES.map(...)`;
+- `sort` calls (N log N comparator calls) and the work done per comparison;
+- string allocations (`toLowerCase`/`toUpperCase`), `localeCompare`, string
+  `includes` and regex operations inside those loops;
+- calls to local helpers (e.g. `getSeriesName`), charged with the cost of the
+  helper body at each call site.
+
+Collections are catalog-sized (N) when their name looks like catalog data
+(catalog, items, equipment, ...) or they are assigned from such a chain. Other
+collections such as `CATEGORIES` count as small (K). Work inside `useMemo` is
+reported separately, since it does not run on every render. Event handlers and
+`useCallback`/`useEffect` bodies are not counted. Code outside any function
+(e.g. a patch block) is treated as render code. Costs are in relative units
+(one callback invocation = 1); they are meant for ranking and for comparing two
+versions, not for predicting milliseconds.
+
+    python render_cost.py components/InventoryPanel.tsx
+    python render_cost.py components/*.tsx --sizes 500,5000 --json reports/render-cost.json
+"""
+
+import argparse
+import glob
+import json
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_SMALL = 8
+
+# Project inventory/entries are per-project lists, much smaller than the catalog.
+CATALOG_NAMES = re.compile(r'catalog|items|equipment|results', re.I)
+
+ITERATION_OPS = {'filter', 'map', 'forEach', 'find', 'findIndex', 'findLast', 'some', 'every',
+                 'reduce', 'flatMap'}
+
+WEIGHTS = {
+    'iterate': 1,
+    'sort': 1,
+    'lowercase': 4,
+    'locale-compare': 8,
+    'includes': 1,
+    'regex': 10,
+}
+
+IDENT = re.compile(r'[A-Za-z_$][\w$]*')
+METHOD_CALL = re.compile(r'\.\s*([A-Za-z_$][\w$]*)\s*\(')
+PLAIN_CALL = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*\(')
+FUNCTION_DECL = re.compile(r'\bfunction\s+([A-Za-z_$][\w$]*)')
+ARROW_HELPER = re.compile(
+    r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=;]+)?=\s*(?:async\s+)?'
+    r'(?:\([^()]*\)|[A-Za-z_$][\w$]*)\s*(?::\s*[^=;{]+)?(=>)'
+)
+ASSIGNMENT = re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=;]+)?=\s*([A-Za-z_$][\w$]*)')
+REGEX_LITERAL = re.compile(r'/~+/[a-z]*')
+STRING_OPS = re.compile(r'\.\s*(toLowerCase|toUpperCase|localeCompare|includes)\s*\(|\bnew\s+RegExp\s*\(')
+KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'typeof', 'await', 'new'}
+
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def strip_source(text: str) -> str:
+    """Blank comments and string contents, and mask regex literal bodies as `~`.
+
+    Line structure and offsets are preserved, so positions map to the input.
+    Template literal text is blanked but `${...}` expressions stay code.
+    """
+    out = list(text)
+    n = len(text)
+    i = 0
+    template_depth: List[int] = []  # brace depth of each open `${`; its `}` resumes the template
+    depth = 0
+    last = ''  # last significant code character
+
+    def blank(a, b):
+        for j in range(a, b):
+            if out[j] != '\n':
+                out[j] = ' '
+
+    while i < n:
+        c = text[i]
+        nxt = text[i + 1] if i + 1 < n else ''
+        if c == '/' and nxt == '/':
+            end = text.find('\n', i)
+            end = n if end < 0 else end
+            blank(i, end)
+            i = end
+            continue
+        if c == '/' and nxt == '*':
+            end = text.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            blank(i, end)
+            i = end
+            continue
+        if c in '\'"':
+            j = i + 1
+            while j < n and text[j] != c and text[j] != '\n':
+                j += 2 if text[j] == '\\' else 1
+            blank(i + 1, min(j, n))
+            i = j + 1
+            last = c
+            continue
+        if c == '`' or (c == '}' and template_depth and template_depth[-1] == depth):
+            if c == '}':
+                template_depth.pop()
+                depth -= 1
+            j = i + 1
+            while j < n and text[j] != '`' and not (text[j] == '$' and text[j + 1:j + 2] == '{'):
+                j += 2 if text[j] == '\\' else 1
+            blank(i + 1, min(j, n))
+            if j < n and text[j] == '$':
+                depth += 1
+                template_depth.append(depth)
+                i = j + 2
+            else:
+                i = j + 1
+            last = '`'
+            continue
+        if c == '/' and nxt != '>' and (last in REGEX_PRECEDERS or last == '' or _ends_with_return(text, i)):
+            j = i + 1
+            in_class = False
+            while j < n and text[j] != '\n' and (text[j] != '/' or in_class):
+                if text[j] == '\\':
+                    j += 1
+                elif text[j] == '[':
+                    in_class = True
+                elif text[j] == ']':
+                    in_class = False
+                j += 1
+            if j < n and text[j] == '/':
+                for k in range(i + 1, j):
+                    out[k] = '~'
+                i = j + 1
+                last = '/'
+                continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        if not c.isspace():
+            last = c
+        i += 1
+    return ''.join(out)
+
+
+def _ends_with_return(text: str, pos: int) -> bool:
+    return text[max(0, pos - 8):pos].rstrip().endswith('return')
+
+
+@dataclass(frozen=True)
+class Context:
+    owner: str = 'render'          # 'render', 'deferred' or a helper name
+    memo: bool = False
+    factors: tuple = ()            # sorted factor names, e.g. ('K', 'N', 'logN')
+
+    def times(self, *extra: str) -> 'Context':
+        return Context(self.owner, self.memo, tuple(sorted(self.factors + extra)))
+
+
+@dataclass
+class Finding:
+    line: int
+    op: str
+    detail: str
+    context: str                   # 'render' or 'memo'
+    weight: float
+    factors: tuple
+    cost: Dict[int, float] = field(default_factory=dict)
+
+    def complexity(self) -> str:
+        counts = Counter(self.factors)
+        parts = []
+        for name in ('K', 'N', 'logN', 'logK'):
+            if counts[name]:
+                parts.append(name if counts[name] == 1 else f"{name}^{counts[name]}")
+        return '·'.join(parts) or '1'
+
+
+@dataclass
+class _Frame:
+    char: str
+    context: Context
+    kind: str = ''
+    pseudo: bool = False
+
+
+def evaluate(factors: Sequence[str], n: int, small: int) -> float:
+    value = 1.0
+    for factor in factors:
+        value *= {'N': n, 'K': small, 'logN': math.log2(max(n, 2)),
+                  'logK': math.log2(max(small, 2))}[factor]
+    return value
+
+
+def _skip_back_group(text: str, i: int) -> int:
+    """From a closing bracket at `i`, return the index of its opening bracket."""
+    pairs = {')': '(', ']': '['}
+    close = text[i]
+    level = 0
+    while i >= 0:
+        if text[i] == close:
+            level += 1
+        elif text[i] == pairs[close]:
+            level -= 1
+            if level == 0:
+                return i
+        i -= 1
+    return 0
+
+
+def receiver_head(text: str, dot: int) -> Optional[str]:
+    """Head identifier of the member chain ending at the `.` at `dot`."""
+    i = dot - 1
+    head = None
+    while i >= 0:
+        while i >= 0 and text[i] in ' \t\n?!':
+            i -= 1
+        if i < 0:
+            break
+        if text[i] in ')]':
+            opening = _skip_back_group(text, i)
+            inner = IDENT.match(text, opening + 1)
+            before = text[:opening].rstrip()
+            if before.endswith(('Object.entries', 'Object.values', 'Object.keys', 'Array.from')) and inner:
+                return inner.group(0)
+            i = opening - 1
+            continue
+        j = i
+        while j >= 0 and (text[j].isalnum() or text[j] in '_$'):
+            j -= 1
+        if j == i:
+            break
+        head = text[j + 1:i + 1]
+        k = j
+        while k >= 0 and text[k] in ' \t\n':
+            k -= 1
+        if k >= 0 and text[k] == '.':
+            i = k - 1
+            continue
+        break
+    return head
+
+
+class Analyzer:
+    def __init__(self, source: str, small: int = DEFAULT_SMALL):
+        self.text = strip_source(source)
+        self.small = small
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', self.text)]
+        self.sized = set()
+        for m in ASSIGNMENT.finditer(self.text):
+            if self._is_catalog(m.group(2)):
+                self.sized.add(m.group(1))
+        self.helper_arrows = {m.start(2): m.group(1) for m in ARROW_HELPER.finditer(self.text)}
+        self.helpers = set(self.helper_arrows.values())
+        self.helpers.update(m.group(1) for m in FUNCTION_DECL.finditer(self.text)
+                            if not m.group(1)[0].isupper())
+        self.raw: List[tuple] = []   # (pos, op, detail, weight, context, extra factors)
+
+    def _is_catalog(self, name: Optional[str]) -> bool:
+        return bool(name) and (name in self.sized or bool(CATALOG_NAMES.search(name)))
+
+    def _size(self, head: Optional[str]) -> str:
+        return 'N' if self._is_catalog(head) else 'K'
+
+    def line_of(self, pos: int) -> int:
+        lo, hi = 0, len(self.line_starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.line_starts[mid] <= pos:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1
+
+    def scan(self) -> None:
+        text = self.text
+        events = {}
+        for m in METHOD_CALL.finditer(text):
+            events[m.end() - 1] = ('method', m.group(1), m.start())
+        for m in PLAIN_CALL.finditer(text):
+            declared = text[max(0, m.start() - 9):m.start()].rstrip().endswith('function')
+            if m.group(1) not in KEYWORDS and not declared:
+                events.setdefault(m.end() - 1, ('call', m.group(1), m.start()))
+        markers = []
+        for m in REGEX_LITERAL.finditer(text):
+            markers.append((m.start(), 'regex', 'regex literal', WEIGHTS['regex']))
+        for m in STRING_OPS.finditer(text):
+            op = m.group(1)
+            if op is None:
+                markers.append((m.start(), 'regex', 'new RegExp', WEIGHTS['regex']))
+            elif op in ('toLowerCase', 'toUpperCase'):
+                markers.append((m.start(), 'lowercase', op, WEIGHTS['lowercase']))
+            elif op == 'localeCompare':
+                markers.append((m.start(), 'locale-compare', op, WEIGHTS['locale-compare']))
+            else:
+                markers.append((m.start(), 'includes', op, WEIGHTS['includes']))
+        marker_at = {pos: rest for pos, *rest in markers}
+        functions = {m.end(): m.group(1) for m in FUNCTION_DECL.finditer(text)}
+
+        stack = [_Frame('', Context())]
+        pending_function = None
+        pending_body = None
+        i = 0
+        n = len(text)
+        while i < n:
+            c = text[i]
+            ctx = stack[-1].context
+            if i in marker_at:
+                op, detail, weight = marker_at[i]
+                self.raw.append((i, op, detail, weight, ctx, ()))
+            if i in functions:
+                name = functions[i]
+                owner = 'render' if name[0].isupper() else name
+                pending_function = (len(stack), Context(owner))
+            if c == '(':
+                frame = _Frame('(', ctx)
+                event = events.get(i)
+                if event and event[0] == 'method' and event[1] in ITERATION_OPS | {'sort'}:
+                    size = self._size(receiver_head(text, event[2]))
+                    if event[1] == 'sort':
+                        factors = (size, f"log{size}")
+                        self.raw.append((event[2], 'sort', f"{size}-sized sort", WEIGHTS['sort'], ctx, factors))
+                        frame = _Frame('(', ctx.times(*factors), 'callback')
+                    else:
+                        self.raw.append((event[2], 'iterate', f".{event[1]} over {size}-sized collection",
+                                         WEIGHTS['iterate'], ctx, (size,)))
+                        frame = _Frame('(', ctx.times(size), 'callback')
+                elif event and event[0] == 'call':
+                    if event[1] == 'useMemo':
+                        frame = _Frame('(', Context(ctx.owner, True, ctx.factors), 'callback')
+                    elif event[1] in ('useCallback', 'useEffect', 'useLayoutEffect'):
+                        frame = _Frame('(', Context('deferred'), 'deferred')
+                    elif event[1] in self.helpers:
+                        self.raw.append((event[2], 'call', event[1], 0, ctx, ()))
+                stack.append(frame)
+            elif c in '{[':
+                frame_ctx = ctx
+                if c == '{' and pending_body is not None:
+                    frame_ctx, pending_body = pending_body, None
+                elif c == '{' and pending_function and pending_function[0] == len(stack):
+                    frame_ctx, pending_function = pending_function[1], None
+                stack.append(_Frame(c, frame_ctx))
+            elif c in ')}]':
+                while len(stack) > 1 and stack[-1].pseudo:
+                    stack.pop()
+                if len(stack) > 1:
+                    stack.pop()
+            elif c in ';,' and stack[-1].pseudo:
+                while len(stack) > 1 and stack[-1].pseudo:
+                    stack.pop()
+            elif c == '=' and text[i + 1:i + 2] == '>':
+                body_ctx = self._arrow_context(i, stack)
+                j = i + 2
+                while j < n and text[j].isspace():
+                    j += 1
+                if j < n and text[j] == '{':
+                    pending_body = body_ctx
+                elif body_ctx != ctx:
+                    stack.append(_Frame('', body_ctx, pseudo=True))
+                i += 2
+                continue
+            i += 1
+
+    def _arrow_context(self, arrow_pos: int, stack: List[_Frame]) -> Context:
+        top = next((frame for frame in reversed(stack) if not frame.pseudo), stack[0])
+        if arrow_pos in self.helper_arrows:
+            return Context(self.helper_arrows[arrow_pos])
+        if top.kind == 'callback':
+            return stack[-1].context
+        return Context('deferred')
+
+    def findings(self, sizes: Sequence[int]) -> List[Finding]:
+        helper_terms: Dict[str, List[tuple]] = {}
+        for pos, op, detail, weight, ctx, extra in self.raw:
+            if ctx.owner not in ('render', 'deferred'):
+                helper_terms.setdefault(ctx.owner, []).append((op, weight, ctx.factors + extra))
+
+        def expand(name, seen=()):
+            terms = []
+            for op, weight, factors in helper_terms.get(name, []):
+                if op == 'call':
+                    continue
+                terms.append((op, weight, factors))
+            for pos, op, detail, weight, ctx, extra in self.raw:
+                if op == 'call' and ctx.owner == name and detail not in seen:
+                    terms += [(o, w, ctx.factors + f) for o, w, f in expand(detail, seen + (name,))]
+            return terms
+
+        result = []
+        for pos, op, detail, weight, ctx, extra in self.raw:
+            if ctx.owner != 'render':
+                continue
+            context = 'memo' if ctx.memo else 'render'
+            if op == 'call':
+                terms = expand(detail)
+                if not terms:
+                    continue
+                ops = Counter(o for o, _, _ in terms)
+                inner = ', '.join(f"{o} x{k}" for o, k in sorted(ops.items()))
+                reference = max(sizes)
+                dominant = max(terms, key=lambda t: t[1] * evaluate(ctx.factors + t[2], reference, self.small))
+                factors = tuple(sorted(ctx.factors + dominant[2]))
+                finding = Finding(self.line_of(pos), 'call', f"{detail}() [{inner}]", context, 0, factors)
+                finding.cost = {n: sum(w * evaluate(ctx.factors + f, n, self.small) for _, w, f in terms)
+                                for n in sizes}
+            else:
+                factors = tuple(sorted(ctx.factors + extra))
+                finding = Finding(self.line_of(pos), op, detail, context, weight, factors)
+                finding.cost = {n: weight * evaluate(factors, n, self.small) for n in sizes}
+            result.append(finding)
+        return result
+
+
+def analyze_source(source: str, sizes: Sequence[int] = DEFAULT_SIZES,
+                   small: int = DEFAULT_SMALL, name: str = '<source>') -> dict:
+    """Ranked per-render cost report for one TSX source (see module docstring)."""
+    analyzer = Analyzer(source, small)
+    analyzer.scan()
+    findings = analyzer.findings(sizes)
+    reference = max(sizes)
+    findings.sort(key=lambda f: (-f.cost[reference], f.line))
+    totals = {
+        context: {str(n): sum(f.cost[n] for f in findings if f.context == context) for n in sizes}
+        for context in ('render', 'memo')
+    }
+    return {
+        'file': name,
+        'sizes': list(sizes),
+        'small_collection': small,
+        'per_render': totals['render'],
+        'memoized': totals['memo'],
+        'findings': [
+            {
+                'line': f.line, 'op': f.op, 'detail': f.detail, 'context': f.context,
+                'complexity': f.complexity(), 'weight': f.weight,
+                'cost': {str(n): round(f.cost[n], 1) for n in sizes},
+                'share': round(f.cost[reference] / totals[f.context][str(reference)], 4)
+                if totals[f.context][str(reference)] else 0.0,
+            }
+            for f in findings
+        ],
+    }
+
+
+def cost_delta(old_source: str, new_source: str, sizes: Sequence[int] = DEFAULT_SIZES,
+               small: int = DEFAULT_SMALL) -> dict:
+    """Per-render cost of two versions of a block, keyed by catalog size."""
+    old = analyze_source(old_source, sizes, small)['per_render']
+    new = analyze_source(new_source, sizes, small)['per_render']
+    return {size: {'old': old[size], 'new': new[size], 'delta': new[size] - old[size]} for size in old}
+
+
+def format_delta(delta: dict) -> str:
+    parts = []
+    for size, row in delta.items():
+        change = f"{row['delta']:+,.0f}"
+        if row['old']:
+            change += f" ({100 * row['delta'] / row['old']:+.1f}%)"
+        parts.append(f"N={int(size):,}: {row['old']:,.0f} -> {row['new']:,.0f} {change}")
+    return '; '.join(parts)
+
+
+def format_report(report: dict, top: int = 15) -> str:
+    sizes = report['sizes']
+    reference = str(max(sizes))
+    lines = [f"{report['file']}: per-render cost (relative units, K={report['small_collection']})"]
+    for context, label in (('per_render', 'every render'), ('memoized', 'useMemo')):
+        totals = '   '.join(f"N={n:,}: {report[context][str(n)]:,.0f}" for n in sizes)
+        lines.append(f"  {label:<12} {totals}")
+    lines.append(f"  {'rank':>4} {'line':>5} {'cost@N=' + f'{int(reference):,}':>14} {'share':>6}  "
+                 f"{'complexity':<12} finding")
+    for rank, f in enumerate(report['findings'][:top], start=1):
+        memo = ' (useMemo)' if f['context'] == 'memo' else ''
+        lines.append(f"  {rank:>4} {f['line']:>5} {f['cost'][reference]:>14,.0f} {f['share']:>6.0%}  "
+                     f"{f['complexity']:<12} {f['op']}: {f['detail']}{memo}")
+    if len(report['findings']) > top:
+        lines.append(f"  ... {len(report['findings']) - top} more")
+    return '\n'.join(lines)
+
+
+def parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sizes {value!r}")
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError('sizes must be positive integers')
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='+', help='TSX files or glob patterns')
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help='catalog sizes to evaluate, comma separated (default: 100,1000,10000)')
+    parser.add_argument('--small', type=int, default=DEFAULT_SMALL,
+                        help='assumed size of non-catalog collections such as CATEGORIES (default: 8)')
+    parser.add_argument('--top', type=int, default=15, help='findings per file in the text report')
+    parser.add_argument('--json', metavar='PATH', help="write the full report as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for pattern in args.files:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+
+    reports = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as exc:
+            print(f"error: {path}: {exc}", file=sys.stderr)
+            return 1
+        reports.append(analyze_source(source, args.sizes, args.small, path))
+
+    reference = str(max(args.sizes))
+    reports.sort(key=lambda r: -r['per_render'][reference])
+    if args.json:
+        payload = json.dumps(reports, indent=2)
+        if args.json == '-':
+            print(payload)
+        else:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(payload + '\n')
+    if args.json != '-':
+        print('\n\n'.join(format_report(report, args.top) for report in reports))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
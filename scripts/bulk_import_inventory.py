@@ -0,0 +1,624 @@
+"""Streaming, chunked bulk importer for inventory CSV files.
+
+Reads the imports/inventory-template.csv / inventory-template-tr.csv formats
+with the same rules as lib/inventory-import.ts (delimiter detection, header
+canonicalization and aliases, locale-aware numbers, JSON field coercion,
+per-row CsvImportIssue-style issues), but without holding the file in memory:
+
+- the CSV is read as a stream and cut into chunks of rows;
+- chunks are validated by `parse_import_row` in a process pool, with only a
+  few chunks in flight at a time;
+- valid rows are upserted into EquipmentItem (keyed by brand/model/name) in
+  batched transactions with `executemany`, skipping rows that would not change.
+
+Issues are streamed to a CSV report and throughput is printed at the end.
+
+    python scripts/bulk_import_inventory.py imports/inventory-template-tr.csv --dry-run
+    python scripts/bulk_import_inventory.py rental-house.csv --jobs 8 --batch-size 5000
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from catalog_db import add_db_argument, connect
+
+DESTINATION_FIELDS = {
+    'name': 'name',
+    'brand': 'brand',
+    'model': 'model',
+    'category': 'category',
+    'subcategory': 'subcategory',
+    'description': 'description',
+    'daily_rate_est': 'daily_rate_est',
+    'mount': 'mount',
+    'weight_kg': 'weight_kg',
+    'resolution': 'resolution',
+    'dynamic_range': 'dynamic_range',
+    'native_iso': 'native_iso',
+    'focal_length': 'focal_length',
+    'aperture': 'aperture',
+    'power_draw_w': 'power_draw_w',
+    'sensor_size': 'sensor_size',
+    'sensor_type': 'sensor_type',
+    'image_circle_mm': 'image_circle_mm',
+    'lens_type': 'lens_type',
+    'close_focus_m': 'close_focus_m',
+    'front_diameter_mm': 'front_diameter_mm',
+    'length_mm': 'length_mm',
+    'squeeze': 'squeeze',
+    'coverage': 'coverage',
+    'sensor_coverage': 'sensor_coverage',
+    'recording_formats': 'recordingFormats',
+    'recording_formats_json': 'recordingFormats',
+    'recordingformats': 'recordingFormats',
+    'recording_formatsjson': 'recordingFormats',
+    'recording_formatsraw': 'recordingFormats',
+    'recordingformatsjson': 'recordingFormats',
+    'technical_data': 'technicalData',
+    'technical_data_json': 'technicalData',
+    'technicaldata': 'technicalData',
+    'technicaldatajson': 'technicalData',
+    'lab_metrics': 'labMetrics',
+    'lab_metrics_json': 'labMetrics',
+    'labmetrics': 'labMetrics',
+    'labmetricsjson': 'labMetrics',
+    'image_url': 'imageUrl',
+    'imageurl': 'imageUrl',
+    'payload_kg': 'payload_kg',
+    'status': 'status',
+    'is_ai_researched': 'isAiResearched',
+    'ai_researched': 'isAiResearched',
+    'isverified': 'isVerified',
+    'is_verified': 'isVerified',
+    'isprivate': 'isPrivate',
+    'is_private': 'isPrivate',
+    'source_url': 'sourceUrl',
+    'sourceurl': 'sourceUrl',
+    'parent_id': 'parentId',
+    'parentid': 'parentId',
+}
+
+HEADER_ALIASES = {
+    'equipment_name': 'name',
+    'item_name': 'name',
+    'product_name': 'name',
+    'title': 'name',
+    'brand_name': 'brand',
+    'model_name': 'model',
+    'cat': 'category',
+    'sub_category': 'subcategory',
+    'subcat': 'subcategory',
+    'daily_rate': 'daily_rate_est',
+    'day_rate': 'daily_rate_est',
+    'gunluk_ucret': 'daily_rate_est',
+    'gunluk_ucret_tl': 'daily_rate_est',
+    'recording_formats_text': 'recordingFormats',
+    'recording_formats_notes': 'recordingFormats',
+    'technical_notes': 'technicalData',
+    'lab_notes': 'labMetrics',
+}
+
+BOOLEAN_TRUE = {'1', 'true', 'yes', 'y', 'evet'}
+BOOLEAN_FALSE = {'0', 'false', 'no', 'n', 'hayir', 'hayır'}
+
+INTEGER_FIELDS = ('power_draw_w', 'image_circle_mm', 'front_diameter_mm', 'length_mm')
+FLOAT_FIELDS = ('weight_kg', 'close_focus_m', 'payload_kg')
+STRING_FIELDS = (
+    'subcategory', 'description', 'mount', 'resolution', 'dynamic_range', 'native_iso',
+    'focal_length', 'aperture', 'sensor_size', 'sensor_type', 'lens_type', 'squeeze',
+    'coverage', 'sensor_coverage', 'imageUrl', 'sourceUrl', 'parentId',
+)
+BOOLEAN_FIELDS = ('isAiResearched', 'isVerified', 'isPrivate')
+
+# Specs/JSON cells can exceed the csv module's 128 KB default field limit.
+CSV_FIELD_SIZE_LIMIT = 2 ** 31 - 1
+
+Issue = Dict[str, object]
+
+
+def issue(row: int, level: str, field: str, message: str) -> Issue:
+    return {'row': row, 'level': level, 'field': field, 'message': message}
+
+
+def canonicalize_header(header: str) -> str:
+    header = header.lstrip('\ufeff')
+    header = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', header).strip().lower()
+    return re.sub(r'[^a-z0-9]+', '_', header).strip('_')
+
+
+def detect_csv_delimiter(first_line: str) -> str:
+    commas = first_line.count(',')
+    semicolons = first_line.count(';')
+    tabs = first_line.count('\t')
+    if tabs > commas and tabs > semicolons:
+        return '\t'
+    if semicolons > commas:
+        return ';'
+    return ','
+
+
+def map_headers(raw_headers: List[str]) -> Tuple[List[str], List[Issue]]:
+    issues = []
+    counts: Dict[str, int] = {}
+    headers = []
+    for index, raw in enumerate(raw_headers):
+        canonical = canonicalize_header(raw.strip())
+        if not canonical:
+            issues.append(issue(1, 'warning', f"header_{index + 1}", 'Bos kolon basligi atlandi.'))
+            headers.append(f"__empty_{index + 1}")
+            continue
+        mapped = HEADER_ALIASES.get(canonical) or DESTINATION_FIELDS.get(canonical) or canonical
+        counts[mapped] = counts.get(mapped, 0) + 1
+        headers.append(mapped)
+    for header, count in counts.items():
+        if count > 1:
+            issues.append(issue(1, 'warning', header,
+                                f"Ayni kolon {count} kez bulundu. Son deger kullanilacak."))
+    return headers, issues
+
+
+def read_csv_rows(path: str) -> Tuple[List[str], List[Issue], Iterator[Tuple[int, Dict[str, str]]]]:
+    """Open `path` and return its mapped headers, header issues and a row stream.
+
+    Rows are numbered like parseCsvTable/import-inventory-csv.ts: blank rows
+    are dropped and the first data row is row 2.
+    """
+    csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+    f = open(path, 'r', encoding='utf-8', newline='')
+    first_line = ''
+    while True:
+        line = f.readline()
+        if not line or line.strip():
+            first_line = line
+            break
+    f.seek(0)
+    reader = csv.reader(f, delimiter=detect_csv_delimiter(first_line.strip()))
+    raw_headers = next(reader, None)
+    if raw_headers is None:
+        f.close()
+        return [], [issue(1, 'error', 'file', 'CSV dosyasi bos.')], iter(())
+    headers, issues = map_headers(raw_headers)
+
+    def rows():
+        with f:
+            row_number = 1
+            for cells in reader:
+                if all(not cell.strip() for cell in cells):
+                    continue
+                row_number += 1
+                row = {}
+                for index, header in enumerate(headers):
+                    if header.startswith('__empty_'):
+                        continue
+                    row[header] = cells[index].strip() if index < len(cells) else ''
+                yield row_number, row
+
+    return headers, issues, rows()
+
+
+def normalize_category(raw: Optional[str]) -> Tuple[str, bool]:
+    if not raw:
+        return 'SUP', True
+    value = raw.lower().strip()
+    compact = re.sub(r'\s+', '', value)
+    if compact == 'cam' or 'camera' in value:
+        return 'CAM', True
+    if compact == 'lns' or 'lens' in value:
+        return 'LNS', True
+    if compact == 'lit' or 'light' in value:
+        return 'LIT', True
+    if compact == 'sup' or any(word in value for word in (
+            'support', 'accessor', 'monitor', 'tripod', 'head', 'battery', 'power', 'media', 'card')):
+        return 'SUP', True
+    return 'SUP', False
+
+
+def _split_number(value: str, separator: str, integer: bool) -> str:
+    parts = value.split(separator)
+    decimal = parts[-1]
+    likely_thousands = len(decimal) == 3 and (len(parts) > 2 or integer)
+    return ''.join(parts) if likely_thousands else f"{''.join(parts[:-1])}.{decimal}"
+
+
+def parse_locale_number(raw: str, integer: bool):
+    """Port of parseLocaleNumber: "1.500" -> 1500, "2,9" -> 2.9, "1.234,5" -> 1234.5."""
+    value = re.sub(r'[^0-9,.\-]', '', re.sub(r'\s+', '', raw.strip()))
+    if not value or value in ('-', '.', ','):
+        return None
+
+    last_comma = value.rfind(',')
+    last_dot = value.rfind('.')
+    if last_comma != -1 and last_dot != -1:
+        decimal_index = max(last_comma, last_dot)
+        integer_part = re.sub(r'[.,]', '', value[:decimal_index])
+        decimal_part = re.sub(r'[^0-9]', '', value[decimal_index + 1:])
+        value = f"{integer_part}.{decimal_part}" if decimal_part else integer_part
+    elif last_comma != -1:
+        value = _split_number(value, ',', integer)
+    elif last_dot != -1:
+        value = _split_number(value, '.', integer)
+
+    try:
+        parsed = float(value) if value else 0.0  # Number("") is 0
+    except ValueError:
+        return None
+    if not math.isfinite(parsed):
+        return None
+    return math.floor(parsed + 0.5) if integer else parsed
+
+
+def parse_optional_boolean(raw: str) -> Optional[bool]:
+    normalized = raw.strip().lower()
+    if normalized in BOOLEAN_TRUE:
+        return True
+    if normalized in BOOLEAN_FALSE:
+        return False
+    return None
+
+
+def default_daily_rate(category: str) -> int:
+    return {'CAM': 500, 'LNS': 150, 'LIT': 120}.get(category, 75)
+
+
+def _dump_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def coerce_json_field(field: str, raw: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    trimmed = (raw or '').strip()
+    if not trimmed:
+        return None, None
+    if trimmed.startswith('{') or trimmed.startswith('['):
+        try:
+            return _dump_json(json.loads(trimmed)), None
+        except ValueError:
+            return None, f"{field} JSON parse edilemedi, alan bos birakildi."
+    if field == 'recordingFormats':
+        formats = [{'format': x.strip()} for x in trimmed.split('|') if x.strip()]
+        return (_dump_json(formats) if formats else None), None
+    if field == 'technicalData':
+        return _dump_json([{'title': 'Imported Notes', 'items': [{'label': 'Notes', 'value': trimmed}]}]), \
+            'technicalData duz metinden JSON alana cevrildi.'
+    return _dump_json({'notes': trimmed}), 'labMetrics duz metinden JSON alana cevrildi.'
+
+
+def parse_import_row(row: Dict[str, str], row_number: int) -> Tuple[Optional[dict], List[Issue]]:
+    """Port of parseImportRow; returns (item, issues) with item None for invalid rows."""
+    issues: List[Issue] = []
+
+    def read(field):
+        return (row.get(field) or '').strip() or None
+
+    brand, model, name = read('brand'), read('model'), read('name')
+    for field, value in (('brand', brand), ('model', model), ('name', name)):
+        if not value:
+            issues.append(issue(row_number, 'error', field, f"{field} bos olamaz."))
+
+    category_raw = read('category')
+    category, recognized = normalize_category(category_raw)
+    if category_raw and not recognized:
+        issues.append(issue(row_number, 'warning', 'category',
+                            f"Kategori '{category_raw}' taninamadi, SUP olarak kullanildi."))
+
+    daily_rate_raw = read('daily_rate_est')
+    daily_rate = parse_locale_number(daily_rate_raw, True) if daily_rate_raw else None
+    if daily_rate_raw and daily_rate is None:
+        issues.append(issue(row_number, 'warning', 'daily_rate_est',
+                            f"daily_rate_est sayi degil ('{daily_rate_raw}'), varsayilan deger kullanildi."))
+    if daily_rate is None:
+        daily_rate = default_daily_rate(category)
+
+    description = read('description') or f"{brand or ''} {model or ''}".strip() or 'Imported item'
+
+    if not brand or not model or not name:
+        return None, issues
+
+    data = {
+        'name': name,
+        'brand': brand,
+        'model': model,
+        'category': category,
+        'description': description,
+        'daily_rate_est': daily_rate,
+    }
+
+    for field in STRING_FIELDS:
+        value = read(field)
+        if value:
+            data[field] = value
+
+    for fields, integer in ((INTEGER_FIELDS, True), (FLOAT_FIELDS, False)):
+        for field in fields:
+            raw = read(field)
+            if not raw:
+                continue
+            parsed = parse_locale_number(raw, integer)
+            if parsed is None:
+                issues.append(issue(row_number, 'warning', field,
+                                    f"{field} sayi degil ('{raw}'), alan atlandi."))
+                continue
+            data[field] = parsed
+
+    for field in ('recordingFormats', 'technicalData', 'labMetrics'):
+        value, warning = coerce_json_field(field, read(field))
+        if value:
+            data[field] = value
+        if warning:
+            issues.append(issue(row_number, 'warning', field, warning))
+
+    status_raw = read('status')
+    if status_raw:
+        status = status_raw.strip().upper()
+        if status in ('PENDING', 'APPROVED'):
+            data['status'] = status
+        else:
+            issues.append(issue(row_number, 'warning', 'status',
+                                f"status gecersiz ('{status_raw}'), APPROVED varsayildi."))
+
+    for field in BOOLEAN_FIELDS:
+        raw = read(field)
+        if not raw:
+            continue
+        value = parse_optional_boolean(raw)
+        if value is None:
+            issues.append(issue(row_number, 'warning', field, f"{field} gecersiz ('{raw}'), alan atlandi."))
+        else:
+            data[field] = value
+
+    return {'row': row_number, 'category': category, 'data': data}, issues
+
+
+def parse_chunk(chunk: List[Tuple[int, Dict[str, str]]]) -> List[Tuple[Optional[dict], List[Issue]]]:
+    return [parse_import_row(row, row_number) for row_number, row in chunk]
+
+
+def iter_chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_parsed(rows, chunk_size: int, jobs: Optional[int]):
+    """Parse row chunks over a process pool, yielding results in file order.
+
+    At most two chunks per worker are in flight, so memory stays bounded by
+    chunk size regardless of file size.
+    """
+    if jobs == 1:
+        for chunk in iter_chunks(rows, chunk_size):
+            yield from parse_chunk(chunk)
+        return
+    window = 2 * (jobs or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for chunk in iter_chunks(rows, chunk_size):
+            pending.append(pool.submit(parse_chunk, chunk))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _comparable(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        trimmed = value.strip()
+        if trimmed.startswith('{') or trimmed.startswith('['):
+            try:
+                return _dump_json(json.loads(trimmed))
+            except ValueError:
+                return trimmed
+        return trimmed
+    return value
+
+
+def _same(current, value) -> bool:
+    return current == value or _comparable(current) == _comparable(value)
+
+
+TEMP_KEY_INDEX = 'EquipmentItem_brand_model_name_idx'
+
+
+class EquipmentWriter:
+    """Batched upserts into EquipmentItem keyed by (brand, model, name)."""
+
+    def __init__(self, conn: sqlite3.Connection, dry_run: bool):
+        self.conn = conn
+        self.dry_run = dry_run
+        self.columns = {row['name'] for row in conn.execute('PRAGMA table_info("EquipmentItem")')}
+        self.dropped_fields = set()
+        self.counts = {'insert': 0, 'update': 0, 'unchanged': 0}
+        # Key lookups need a (brand, model, name) index. The unique-key
+        # migration provides one; databases that predate it get a temporary
+        # index that close() drops again, so the schema does not drift.
+        self.has_key_index = self._has_key_index()
+        self.temp_index = not dry_run and not self.has_key_index
+        if self.temp_index:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "{TEMP_KEY_INDEX}" '
+                         'ON "EquipmentItem"("brand", "model", "name")')
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS "_import_keys" '
+                     '("pos" INTEGER PRIMARY KEY, "brand" TEXT, "model" TEXT, "name" TEXT)')
+
+    def _has_key_index(self) -> bool:
+        for index in self.conn.execute('PRAGMA index_list("EquipmentItem")').fetchall():
+            if index['name'] == TEMP_KEY_INDEX:
+                continue  # left behind by an earlier import; dropped by close()
+            columns = [row['name'] for row in self.conn.execute(f'PRAGMA index_info("{index["name"]}")')]
+            if columns == ['brand', 'model', 'name']:
+                return True
+        return False
+
+    def close(self) -> None:
+        if self.temp_index:
+            self.conn.execute(f'DROP INDEX IF EXISTS "{TEMP_KEY_INDEX}"')
+            self.temp_index = False
+
+    def _existing(self, items: List[dict]) -> Dict[Tuple[str, str, str], sqlite3.Row]:
+        self.conn.execute('DELETE FROM "_import_keys"')
+        self.conn.executemany(
+            'INSERT INTO "_import_keys" VALUES (?, ?, ?, ?)',
+            ((pos, item['data']['brand'], item['data']['model'], item['data']['name'])
+             for pos, item in enumerate(items)),
+        )
+        found = {}
+        for row in self.conn.execute('''
+            SELECT e.* FROM "_import_keys" k
+            JOIN "EquipmentItem" e ON e."brand" = k."brand" AND e."model" = k."model" AND e."name" = k."name"
+        '''):
+            found.setdefault((row['brand'], row['model'], row['name']), row)
+        return found
+
+    def write(self, items: List[dict]) -> None:
+        existing = self._existing(items)
+        now = int(time.time() * 1000)
+        inserts: Dict[tuple, list] = {}
+        updates: Dict[tuple, list] = {}
+        # Values per key after the rows seen so far. A key repeated within the
+        # batch is diffed against the earlier rows, not the database, and its
+        # rows are merged in file order so the last value of each field wins.
+        merged: Dict[Tuple[str, str, str], dict] = {}
+        new_keys = set()
+
+        for item in items:
+            data = {}
+            for field, value in item['data'].items():
+                if field in self.columns:
+                    data[field] = int(value) if isinstance(value, bool) else value
+                else:
+                    self.dropped_fields.add(field)
+            key = (data['brand'], data['model'], data['name'])
+            current = merged.get(key)
+
+            if current is None:
+                if key not in existing:
+                    merged[key] = data
+                    new_keys.add(key)
+                    self.counts['insert'] += 1
+                    continue
+                current = merged[key] = dict(existing[key])
+
+            changed = {f: v for f, v in data.items() if not _same(current.get(f), v)}
+            if not changed:
+                self.counts['unchanged'] += 1
+                continue
+            current.update(changed)
+            self.counts['update'] += 1
+
+        for key, current in merged.items():
+            if key in new_keys:
+                fields = tuple(sorted(current))
+                inserts.setdefault(fields, []).append(
+                    (f"c{uuid.uuid4().hex[:24]}", *(current[f] for f in fields), now, now))
+                continue
+            stored = existing[key]
+            fields = tuple(sorted(f for f in current if not _same(stored[f], current[f])))
+            if fields:
+                updates.setdefault(fields, []).append((*(current[f] for f in fields), now, stored['id']))
+
+        if self.dry_run:
+            return
+        with self.conn:
+            for fields, rows in inserts.items():
+                names = ', '.join(f'"{f}"' for f in ('id', *fields, 'createdAt', 'updatedAt'))
+                marks = ', '.join('?' for _ in range(len(fields) + 3))
+                self.conn.executemany(f'INSERT INTO "EquipmentItem" ({names}) VALUES ({marks})', rows)
+            for fields, rows in updates.items():
+                assignments = ', '.join(f'"{f}" = ?' for f in (*fields, 'updatedAt'))
+                self.conn.executemany(f'UPDATE "EquipmentItem" SET {assignments} WHERE "id" = ?', rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('file', help='inventory CSV (comma, semicolon or tab separated)')
+    parser.add_argument('--dry-run', action='store_true', help='validate and classify rows without writing')
+    parser.add_argument('--only-cam-lens', action='store_true', help='import only CAM and LNS rows')
+    parser.add_argument('--status', type=str.upper, choices=('PENDING', 'APPROVED'),
+                        help='force status on every imported row')
+    parser.add_argument('--batch-size', type=int, default=2000, help='rows per write transaction')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='rows per parse task')
+    parser.add_argument('--jobs', type=int, default=None, help='parser processes (default: CPU count)')
+    parser.add_argument('--issues', default=os.path.join('reports', 'bulk-import-issues.csv'),
+                        help='CSV file receiving per-row issues')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        conn = connect(args.db)
+        writer = EquipmentWriter(conn, args.dry_run)
+        headers, header_issues, rows = read_csv_rows(args.file)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.issues)), exist_ok=True)
+    totals = {'rows': 0, 'invalid': 0, 'filtered': 0, 'errors': 0, 'warnings': 0}
+    with open(args.issues, 'w', encoding='utf-8', newline='') as issues_file:
+        issue_writer = csv.DictWriter(issues_file, fieldnames=('row', 'level', 'field', 'message'))
+        issue_writer.writeheader()
+
+        def record(issues):
+            for entry in issues:
+                totals['errors' if entry['level'] == 'error' else 'warnings'] += 1
+                issue_writer.writerow(entry)
+
+        record(header_issues)
+        batch = []
+        try:
+            for item, issues in iter_parsed(rows, args.chunk_size, args.jobs):
+                totals['rows'] += 1
+                record(issues)
+                if item is None:
+                    totals['invalid'] += 1
+                    continue
+                if args.status:
+                    item['data']['status'] = args.status
+                if args.only_cam_lens and item['category'] not in ('CAM', 'LNS'):
+                    totals['filtered'] += 1
+                    continue
+                batch.append(item)
+                if len(batch) >= args.batch_size:
+                    writer.write(batch)
+                    batch = []
+            if batch:
+                writer.write(batch)
+        except (OSError, UnicodeDecodeError, csv.Error, sqlite3.Error) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - started
+    counts = writer.counts
+    print(f"{'Dry run' if args.dry_run else 'Import'}: {totals['rows']} rows in {elapsed:.2f}s "
+          f"({totals['rows'] / elapsed if elapsed else 0:.0f} rows/s)")
+    print(f"  {counts['insert']} inserts, {counts['update']} updates, {counts['unchanged']} unchanged, "
+          f"{totals['invalid']} invalid, {totals['filtered']} filtered")
+    print(f"  {totals['errors']} errors, {totals['warnings']} warnings -> {args.issues}")
+    if writer.dropped_fields:
+        print(f"  fields not in this database, skipped: {', '.join(sorted(writer.dropped_fields))}")
+    if not args.dry_run and not writer.has_key_index:
+        print("  no brand/model/name index in this database; apply the unique-key migration "
+              "(prisma migrate deploy) to speed up later imports")
+    return 0 if counts['insert'] + counts['update'] + counts['unchanged'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Shared SQLite access for the Python catalog tools in scripts/.
+
+The tools read the Prisma SQLite database (prisma/dev.db by default) directly
+with the standard library driver; pass --db to point them at another copy.
+Tables they derive from the catalog live in their own SQLite files under
+.cache/, never in the tracked database, so Prisma does not see schema drift.
+"""
+
+import os
+import sqlite3
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(ROOT_DIR, 'prisma', 'dev.db')
+CACHE_DIR = os.path.join(ROOT_DIR, '.cache')
+
+
+def connect(path: str = DEFAULT_DB, readonly: bool = False) -> sqlite3.Connection:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"database not found: {path}")
+    if readonly:
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def open_sidecar(db_path: str, sidecar_path: str) -> sqlite3.Connection:
+    """Open (creating if needed) a sidecar database with db_path attached read-only as `catalog`."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"database not found: {db_path}")
+    os.makedirs(os.path.dirname(os.path.abspath(sidecar_path)), exist_ok=True)
+    conn = sqlite3.connect(f"file:{os.path.abspath(sidecar_path)}", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute('ATTACH DATABASE ? AS "catalog"', (f"file:{os.path.abspath(db_path)}?mode=ro",))
+    return conn
+
+
+def add_db_argument(parser) -> None:
+    parser.add_argument('--db', default=DEFAULT_DB,
+                        help='SQLite database (default: prisma/dev.db)')
@@ -0,0 +1,285 @@
+"""Indexed catalog query engine mirroring the InventoryPanel filter/sort pipeline.
+
+Gives the same ordered result as the catalog modal block in
+components/InventoryPanel.tsx (tab, technical filter, lens type, coverage and
+name/brand search, sorted by brand then model/name) without rescanning the
+catalog per query:
+
+- rows are stored once in brand/model order with their lowercased sort keys
+  and search fields computed at build time, so results never need sorting;
+- category, sensor_size, subcategory and coverage facets, the Vintage lens
+  heuristic and the SUP/LIT technical groups are packed NumPy bitmaps (one
+  bit per row, each built once from its row positions), so a query is a
+  handful of vectorized ANDs;
+- search text is narrowed through trigram posting lists before the substring
+  check.
+
+The built index is pickled to .cache/catalog-query.pickle and reused by later
+runs until the database file changes (size or mtime), so only the first query
+after a catalog edit pays for the build.
+
+Requires numpy (pip install -r scripts/requirements.txt).
+
+    python scripts/catalog_query.py --tab LNS --lens-type Vintage --coverage FF
+    python scripts/catalog_query.py --tab SUP --technical Filters --search nd --format csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit('error: numpy is required: pip install -r scripts/requirements.txt')
+
+from catalog_db import ROOT_DIR, add_db_argument, connect
+
+DEFAULT_CACHE = os.path.join(ROOT_DIR, '.cache', 'catalog-query.pickle')
+
+CACHE_VERSION = 1
+
+COLUMNS = ('id', 'name', 'brand', 'model', 'category', 'subcategory',
+           'sensor_size', 'coverage', 'parentId')
+
+EXCLUDED_SUBCATEGORIES = ('Extension', 'Extension Cable')
+
+VINTAGE_NAME_MARKERS = ('K35', 'Baltar', 'Panchro', 'Kowa', 'Tribe7', 'Vintage')
+
+SUPPORT_SUBCATEGORIES = ('Head', 'Handheld', 'Vest', 'Rods', 'Tripod', 'Gimbal',
+                         'Dolly', 'Slider', 'Fluid Head', 'Tripod Legs')
+
+# technicalFilter values for SUP/LIT that match on a subcategory predicate
+# rather than equality, in the order InventoryPanel checks them.
+TECHNICAL_GROUPS = {
+    'Filters': lambda sub: 'Filter' in sub,
+    'Batteries': lambda sub: 'Batter' in sub,
+    'Media': lambda sub: 'Media' in sub or 'Card' in sub,
+    'Matte Box': lambda sub: 'matte' in sub.lower(),
+    'Focus': lambda sub: 'Focus' in sub or 'FIZ' in sub,
+    'Wireless': lambda sub: 'Wireless' in sub or 'Transmitter' in sub,
+    'Support': lambda sub: sub in SUPPORT_SUBCATEGORIES,
+    'Audio': lambda sub: 'Microphone' in sub or 'Recorder' in sub,
+}
+
+
+@dataclass(frozen=True)
+class CatalogQuery:
+    tab: str
+    technical: str = 'ALL'
+    lens_type: str = 'ALL'
+    coverage: str = 'ALL'
+    search: str = ''
+
+
+def sort_key(row) -> tuple:
+    """Brand (A-Z) then model, falling back to name, all lowercased."""
+    brand = (row['brand'] or '').lower()
+    model = (row['model'] or '').lower() or (row['name'] or '').lower()
+    return brand, model
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def to_bitmap(positions, size: int) -> np.ndarray:
+    """Packed bitmap of `size` bits with the given row positions set."""
+    bits = np.zeros(size, dtype=bool)
+    bits[np.asarray(positions, dtype=np.int64)] = True
+    return np.packbits(bits, bitorder='little')
+
+
+def bitmap_positions(bitmap: np.ndarray, size: int) -> np.ndarray:
+    """Ascending row positions set in a packed bitmap."""
+    return np.flatnonzero(np.unpackbits(bitmap, count=size, bitorder='little'))
+
+
+class CatalogIndex:
+    """Prebuilt, read-only index over EquipmentItem rows."""
+
+    def __init__(self, rows: List[dict]):
+        # Stable sort keeps catalog order for equal keys, like Array.sort.
+        self.rows = sorted(rows, key=sort_key)
+        self.names = [(row['name'] or '').lower() for row in self.rows]
+        self.brands = [(row['brand'] or '').lower() for row in self.rows]
+
+        self.size = size = len(self.rows)
+
+        # Collect row positions first and pack each bitmap once at the end.
+        facets: Dict[str, Dict[Optional[str], List[int]]] = {
+            'category': {}, 'sensor_size': {}, 'subcategory': {}, 'coverage': {},
+        }
+        technical: Dict[str, List[int]] = {name: [] for name in TECHNICAL_GROUPS}
+        top_level: List[int] = []
+        vintage: List[int] = []
+        trigrams: Dict[str, List[int]] = {}
+
+        for pos, row in enumerate(self.rows):
+            for column, values in facets.items():
+                values.setdefault(row[column], []).append(pos)
+            sub = row['subcategory'] or ''
+            for name, predicate in TECHNICAL_GROUPS.items():
+                if predicate(sub):
+                    technical[name].append(pos)
+            if not row['parentId'] and sub not in EXCLUDED_SUBCATEGORIES:
+                top_level.append(pos)
+            if sub == 'Vintage' or any(m in row['name'] for m in VINTAGE_NAME_MARKERS):
+                vintage.append(pos)
+            for gram in _trigrams(self.names[pos]) | _trigrams(self.brands[pos]):
+                trigrams.setdefault(gram, []).append(pos)
+
+        self.empty = to_bitmap([], size)
+        self.facets = {column: {value: to_bitmap(positions, size) for value, positions in values.items()}
+                       for column, values in facets.items()}
+        self.technical = {name: to_bitmap(positions, size) for name, positions in technical.items()}
+        self.top_level = to_bitmap(top_level, size)
+        self.vintage = to_bitmap(vintage, size)
+        # Postings stay as sorted position arrays; there are too many grams
+        # to keep a full-width bitmap for each.
+        self.trigrams = {gram: np.array(positions, dtype=np.int32) for gram, positions in trigrams.items()}
+
+    @classmethod
+    def from_db(cls, conn) -> 'CatalogIndex':
+        columns = ', '.join(f'"{c}"' for c in COLUMNS)
+        cursor = conn.execute(f'SELECT {columns} FROM "EquipmentItem" ORDER BY rowid')
+        return cls([dict(row) for row in cursor])
+
+    def facet(self, column: str, value) -> np.ndarray:
+        return self.facets[column].get(value, self.empty)
+
+    def candidates(self, query: CatalogQuery) -> np.ndarray:
+        """Ascending positions of rows that pass the facet filters and trigrams."""
+        bitmap = self.facet('category', query.tab) & self.top_level
+
+        if query.tab == 'CAM' and query.technical != 'ALL':
+            bitmap &= self.facet('sensor_size', query.technical)
+
+        if query.tab == 'LNS':
+            if query.lens_type == 'Vintage':
+                bitmap &= self.vintage
+            elif query.lens_type != 'ALL':
+                bitmap &= self.facet('subcategory', query.lens_type)
+            if query.coverage != 'ALL':
+                bitmap &= self.facet('coverage', query.coverage)
+
+        if query.tab in ('SUP', 'LIT') and query.technical != 'ALL':
+            if query.technical in TECHNICAL_GROUPS:
+                bitmap &= self.technical[query.technical]
+            else:
+                bitmap &= self.facet('subcategory', query.technical)
+
+        positions = bitmap_positions(bitmap, self.size)
+        if query.search.strip():
+            empty = np.empty(0, dtype=np.int32)
+            postings = sorted((self.trigrams.get(gram, empty) for gram in _trigrams(query.search.lower())),
+                              key=len)
+            for posting in postings:
+                if not len(positions):
+                    break
+                positions = positions[np.isin(positions, posting, assume_unique=True)]
+        return positions
+
+    @classmethod
+    def cached(cls, db_path: str, cache_path: str = DEFAULT_CACHE) -> 'CatalogIndex':
+        """Load the pickled index for db_path, or build it from the database and save it."""
+        stat = os.stat(db_path)
+        key = (CACHE_VERSION, os.path.realpath(db_path), stat.st_size, stat.st_mtime_ns)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('key') == key:
+                index = cls.__new__(cls)
+                index.__dict__.update(cached['state'])
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            pass
+
+        with closing(connect(db_path, readonly=True)) as conn:
+            index = cls.from_db(conn)
+        directory = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.catalog-query.', suffix='.pickle')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'key': key, 'state': index.__dict__}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return index
+
+    def query(self, query: CatalogQuery) -> List[dict]:
+        """Return the matching rows in InventoryPanel display order."""
+        needle = query.search.lower() if query.search.strip() else None
+        result = []
+        for pos in self.candidates(query).tolist():
+            if needle is not None and needle not in self.names[pos] and needle not in self.brands[pos]:
+                continue
+            result.append(self.rows[pos])
+        return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('--tab', required=True, help='category id (CAM, LNS, LIT, SUP, ...)')
+    parser.add_argument('--technical', default='ALL', help='technical filter (sensor size or subcategory group)')
+    parser.add_argument('--lens-type', default='ALL', help='lens subcategory or Vintage')
+    parser.add_argument('--coverage', default='ALL', help='lens coverage (FF, LF, S35, ...)')
+    parser.add_argument('--search', default='', help='name/brand search text')
+    parser.add_argument('--format', choices=('text', 'json', 'csv'), default='text')
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help='pickled index reused across runs (default: .cache/catalog-query.pickle)')
+    parser.add_argument('--no-cache', action='store_true', help='build the index in memory only')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.no_cache:
+            with closing(connect(args.db, readonly=True)) as conn:
+                index = CatalogIndex.from_db(conn)
+        else:
+            index = CatalogIndex.cached(args.db, args.cache)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    built = time.perf_counter()
+    rows = index.query(CatalogQuery(
+        tab=args.tab, technical=args.technical, lens_type=args.lens_type,
+        coverage=args.coverage, search=args.search,
+    ))
+    queried = time.perf_counter()
+    if args.limit is not None:
+        rows = rows[:args.limit]
+
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            print(f"{row['brand'] or '-'} | {row['model'] or '-'} | {row['name']}")
+
+    print(f"{len(rows)} of {len(index.rows)} items "
+          f"(index {1000 * (built - started):.1f} ms, query {1000 * (queried - built):.2f} ms)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""Persistent inverted index for catalog search, compatible with lib/catalog-search.ts.
+
+`matchesCatalogSearch` matches substrings of a normalized haystack built from
+the item's search fields, so the index cannot key on whole words: a query
+token such as "s4i" must find "Cooke S4/i". Instead, every item's compact
+haystack (normalized, spaces removed) is split into 2- and 3-character grams
+and stored as gram -> item postings in the `_catalog_search_grams` table. A
+query is answered by intersecting the postings of the grams of its
+compact form and of its tokens, then confirming the few candidates against the
+stored haystack with the exact TypeScript rules. Both sides use the same
+`normalizeCatalogSearchText` / `tokenizeCatalogSearch` rules, including alias,
+plural and optional-word handling.
+
+The index lives in its own SQLite file, .cache/catalog-search.sqlite by
+default, with the catalog database ATTACHed read-only as `catalog`, so the
+tracked prisma/dev.db is never written. Use --index to keep one index per
+catalog database. `--update` reindexes only rows whose updatedAt changed and drops deleted rows.
+Use --rebuild after raw SQL edits that do not touch updatedAt.
+
+    python scripts/catalog_search_index.py --update
+    python scripts/catalog_search_index.py "Simera-C T1.5 Cine Primes"
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from typing import Iterable, List, Optional, Set
+
+from catalog_db import CACHE_DIR, DEFAULT_DB, add_db_argument, open_sidecar
+
+DEFAULT_INDEX = os.path.join(CACHE_DIR, 'catalog-search.sqlite')
+
+DOCS_TABLE = '_catalog_search_docs'
+GRAMS_TABLE = '_catalog_search_grams'
+
+# buildCatalogSearchHaystack field order. Fields that are not EquipmentItem
+# columns (dynamic_range, native_iso) are skipped, as they are undefined on
+# catalog rows.
+HAYSTACK_FIELDS = (
+    'name', 'brand', 'model', 'category', 'subcategory', 'coverage', 'mount',
+    'lens_type', 'focal_length', 'aperture', 'description', 'sensor_size',
+    'sensor_type', 'resolution', 'dynamic_range', 'native_iso',
+    'recordingFormats', 'specs_json',
+)
+
+OPTIONAL_SEARCH_WORDS = {
+    'cine', 'cinema', 'lens', 'lense', 'lenses', 'prime', 'primes', 'set', 'kit', 'series',
+}
+
+TOKEN_ALIASES = {
+    'bodies': 'body',
+    'lenses': 'lens',
+    'primes': 'prime',
+}
+
+COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+NON_SEARCH_CHARS = re.compile(r'[^a-z0-9.]+')
+WHITESPACE = re.compile(r'\s+')
+TOKEN = re.compile(r'[a-z0-9]+(?:\.[0-9]+)?')
+
+
+def normalize_catalog_search_text(value: Optional[str]) -> str:
+    """Port of `normalizeCatalogSearchText`."""
+    if not value:
+        return ''
+    value = COMBINING_MARKS.sub('', unicodedata.normalize('NFD', value))
+    value = value.replace('×', 'x').replace('’', '').replace("'", '')
+    value = NON_SEARCH_CHARS.sub(' ', value.lower())
+    return WHITESPACE.sub(' ', value).strip()
+
+
+def tokenize_catalog_search(value: Optional[str]) -> List[str]:
+    """Port of `tokenizeCatalogSearch`."""
+    tokens = []
+    for token in TOKEN.findall(normalize_catalog_search_text(value)):
+        token = TOKEN_ALIASES.get(token, token)
+        if token.endswith('s') and len(token) > 4:
+            token = token[:-1]
+        if len(token) > 1:
+            tokens.append(token)
+    meaningful = [token for token in tokens if token not in OPTIONAL_SEARCH_WORDS]
+    return meaningful or tokens
+
+
+def build_haystack(item) -> str:
+    """Port of `buildCatalogSearchHaystack` for an EquipmentItem row."""
+    keys = item.keys()
+    values = [item[field] for field in HAYSTACK_FIELDS if field in keys]
+    return normalize_catalog_search_text(' '.join(str(v) for v in values if v))
+
+
+def matches_haystack(haystack: str, query: str) -> bool:
+    """`matchesCatalogSearch` against a prebuilt haystack."""
+    normalized_query = normalize_catalog_search_text(query)
+    if not normalized_query:
+        return True
+    if normalized_query in haystack:
+        return True
+    compact = WHITESPACE.sub('', haystack)
+    compact_query = WHITESPACE.sub('', normalized_query)
+    if compact_query and compact_query in compact:
+        return True
+    tokens = tokenize_catalog_search(query)
+    if not tokens:
+        return True
+    return all(token in haystack or token in compact for token in tokens)
+
+
+def grams(text: str) -> Set[str]:
+    """All 2- and 3-character substrings of `text`."""
+    return {text[i:i + n] for n in (2, 3) for i in range(len(text) - n + 1)}
+
+
+def query_grams(text: str) -> Set[str]:
+    """Grams every haystack containing `text` must have (trigrams when possible)."""
+    n = 3 if len(text) >= 3 else 2
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def open_index(db_path: str = DEFAULT_DB, index_path: str = DEFAULT_INDEX) -> sqlite3.Connection:
+    """Open (creating if needed) the index database with db_path attached read-only as `catalog`."""
+    return open_sidecar(db_path, index_path)
+
+
+def has_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute('SELECT 1 FROM "main".sqlite_master WHERE "name" = ?', (DOCS_TABLE,)).fetchone() is not None
+
+
+def ensure_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{DOCS_TABLE}" (
+            "item_id" TEXT NOT NULL PRIMARY KEY,
+            "position" INTEGER NOT NULL,
+            "updated_at" TEXT,
+            "haystack" TEXT NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{GRAMS_TABLE}" (
+            "gram" TEXT NOT NULL,
+            "item_id" TEXT NOT NULL,
+            PRIMARY KEY ("gram", "item_id")
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "{GRAMS_TABLE}_item_idx" ON "{GRAMS_TABLE}"("item_id")')
+
+
+def update_index(conn: sqlite3.Connection, rebuild: bool = False) -> dict:
+    """Index new and changed rows, drop deleted ones; return counts."""
+    ensure_tables(conn)
+    columns = {row['name'] for row in conn.execute('PRAGMA "catalog".table_info("EquipmentItem")')}
+    fields = ', '.join(f'e."{f}"' for f in HAYSTACK_FIELDS if f in columns)
+    changed_only = '' if rebuild else 'WHERE d."item_id" IS NULL OR d."updated_at" IS NOT e."updatedAt"'
+    stale = conn.execute(f'''
+        SELECT e."id", e.rowid AS "position", e."updatedAt", d."haystack" AS "indexed", {fields}
+        FROM "catalog"."EquipmentItem" e
+        LEFT JOIN "{DOCS_TABLE}" d ON d."item_id" = e."id"
+        {changed_only}
+    ''').fetchall()
+
+    reindexed = 0
+    with conn:
+        for item in stale:
+            haystack = build_haystack(item)
+            conn.execute(
+                f'INSERT OR REPLACE INTO "{DOCS_TABLE}" VALUES (?, ?, ?, ?)',
+                (item['id'], item['position'], item['updatedAt'], haystack),
+            )
+            if haystack == item['indexed']:
+                continue
+            reindexed += 1
+            conn.execute(f'DELETE FROM "{GRAMS_TABLE}" WHERE "item_id" = ?', (item['id'],))
+            conn.executemany(
+                f'INSERT INTO "{GRAMS_TABLE}" VALUES (?, ?)',
+                ((gram, item['id']) for gram in grams(WHITESPACE.sub('', haystack))),
+            )
+        deleted = f'SELECT "item_id" FROM "{DOCS_TABLE}" WHERE "item_id" NOT IN (SELECT "id" FROM "catalog"."EquipmentItem")'
+        conn.execute(f'DELETE FROM "{GRAMS_TABLE}" WHERE "item_id" IN ({deleted})')
+        removed = conn.execute(f'DELETE FROM "{DOCS_TABLE}" WHERE "item_id" IN ({deleted})').rowcount
+    return {'scanned': len(stale), 'reindexed': reindexed, 'removed': removed}
+
+
+def _candidates(conn: sqlite3.Connection, required: Iterable[str]):
+    required = sorted(required)
+    if not required:
+        return conn.execute(f'SELECT "item_id", "position", "haystack" FROM "{DOCS_TABLE}"')
+    placeholders = ', '.join('?' for _ in required)
+    return conn.execute(f'''
+        SELECT d."item_id", d."position", d."haystack" FROM "{DOCS_TABLE}" d
+        WHERE d."item_id" IN (
+            SELECT "item_id" FROM "{GRAMS_TABLE}" WHERE "gram" IN ({placeholders})
+            GROUP BY "item_id" HAVING COUNT(*) = ?
+        )
+    ''', (*required, len(required)))
+
+
+def search(conn: sqlite3.Connection, query: str) -> List[str]:
+    """Return ids of matching items in catalog order.
+
+    An item matches when its compact haystack contains the compact query or
+    every query token (a token found in the spaced haystack is also found in
+    the compact one), so the candidates are the union of two postings
+    intersections.
+    """
+    normalized_query = normalize_catalog_search_text(query)
+    tokens = tokenize_catalog_search(query)
+    if not normalized_query or not tokens:
+        return [row['item_id'] for row in
+                conn.execute(f'SELECT "item_id" FROM "{DOCS_TABLE}" ORDER BY "position"')]
+
+    compact_query = WHITESPACE.sub('', normalized_query)
+    token_grams = set().union(*(query_grams(token) for token in tokens))
+    found = {}
+    for required in (query_grams(compact_query), token_grams):
+        for row in _candidates(conn, required):
+            if row['item_id'] not in found and matches_haystack(row['haystack'], query):
+                found[row['item_id']] = row['position']
+    return sorted(found, key=found.get)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('--index', default=DEFAULT_INDEX,
+                        help='index database (default: .cache/catalog-search.sqlite)')
+    parser.add_argument('query', nargs='*', help='search text')
+    parser.add_argument('--update', action='store_true', help='index new and changed rows first')
+    parser.add_argument('--rebuild', action='store_true', help='reindex every row first')
+    args = parser.parse_args(argv)
+
+    try:
+        conn = open_index(args.db, args.index)
+        if args.update or args.rebuild or not has_index(conn):
+            started = time.perf_counter()
+            stats = update_index(conn, rebuild=args.rebuild)
+            print(f"{stats['scanned']} rows scanned, {stats['reindexed']} reindexed, "
+                  f"{stats['removed']} removed ({1000 * (time.perf_counter() - started):.1f} ms)",
+                  file=sys.stderr)
+        if args.query:
+            started = time.perf_counter()
+            ids = search(conn, ' '.join(args.query))
+            elapsed = time.perf_counter() - started
+            for item_id in ids:
+                row = conn.execute('SELECT "name" FROM "catalog"."EquipmentItem" WHERE "id" = ?',
+                                   (item_id,)).fetchone()
+                print(f"{item_id}  {row['name'] if row else ''}")
+            print(f"{len(ids)} matches ({1000 * elapsed:.2f} ms)", file=sys.stderr)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
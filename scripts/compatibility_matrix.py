@@ -0,0 +1,448 @@
+"""Precomputed lens x camera compatibility matrix.
+
+Evaluates the lens checks of `validateCompatibility` (lib/compatibility.ts) for
+every LNS x CAM pair in the catalog at once. Each item is parsed once into
+features: normalized mount IDs, image circle mm and sensor coverage level.
+The rules are then applied with NumPy broadcasting and matrix products over
+mount one-hot arrays. Rules covered: mount overlap, adapter or known
+workaround, physically impossible flange distance, and vignetting risk. The
+camera side uses its catalog defaults, with no per-project recording config.
+
+The result is a uint8 matrix (rows = lenses, columns = cameras) saved as
+.cache/compatibility.npy and opened memory-mapped, plus a JSON index with
+item positions and cached features, so a kit check is one array lookup.
+Rebuilds only re-evaluate rows and columns of items whose relevant fields
+changed.
+
+Requires numpy (pip install -r scripts/requirements.txt).
+
+    python scripts/compatibility_matrix.py --build
+    python scripts/compatibility_matrix.py --check <lens id> <camera id>
+    python scripts/compatibility_matrix.py --kit <kit id>
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit('error: numpy is required: pip install -r scripts/requirements.txt')
+
+from catalog_db import ROOT_DIR, add_db_argument, connect
+
+DEFAULT_OUT = os.path.join(ROOT_DIR, '.cache', 'compatibility')
+ADAPTERS_TS = os.path.join(ROOT_DIR, 'lib', 'adapters.ts')
+
+INDEX_VERSION = 1
+
+# Cell encoding: low two bits are the mount verdict, then coverage flags.
+MOUNT_OK = 0
+MOUNT_ADAPTER = 1
+MOUNT_NO_ADAPTER = 2
+MOUNT_IMPOSSIBLE = 3
+MOUNT_MASK = 0b11
+COVERAGE_IMAGE_CIRCLE = 1 << 2
+COVERAGE_LEVEL = 1 << 3
+
+MOUNT_LABELS = {
+    MOUNT_OK: 'mount ok',
+    MOUNT_ADAPTER: 'adapter needed',
+    MOUNT_NO_ADAPTER: 'mount mismatch, no known adapter',
+    MOUNT_IMPOSSIBLE: 'physically impossible mount',
+}
+
+FLANGE_MM = {
+    'E-MOUNT': 18,
+    'L-MOUNT': 20,
+    'RF': 20,
+    'M-MOUNT': 27.8,
+    'DL': 16.84,
+    'LPL': 44,
+    'PL': 52,
+    'EF': 44,
+}
+
+# Lens/camera mount pairs validateCompatibility offers a written solution for.
+SOLUTION_PAIRS = {('PL', 'E-MOUNT'), ('PL', 'RF'), ('EF', 'E-MOUNT')}
+
+SENSOR_LEVELS = {'S16': 0, 'S35': 1, 'FF': 2, 'LF': 3}
+
+SENSOR_DIMENSIONS = {
+    'S16': (12.52, 7.41),
+    'S35': (27.99, 19.22),
+    'FF': (36.0, 24.0),
+    'LF': (40.96, 21.6),
+}
+
+FEATURE_COLUMNS = ('mount', 'coverage', 'specs_json', 'image_circle_mm',
+                   'sensor_size', 'sensor_type', 'subcategory')
+
+
+def normalize_mount_token(raw: str) -> str:
+    token = re.sub(r'\s+', ' ', raw.strip().upper())
+    aliases = {
+        'E': 'E-MOUNT', 'SONY E': 'E-MOUNT',
+        'M': 'M-MOUNT', 'LEICA M': 'M-MOUNT',
+        'L': 'L-MOUNT', 'LEICA L': 'L-MOUNT',
+        'CANON RF': 'RF', 'CANON EF': 'EF', 'DJI DL': 'DL',
+    }
+    return aliases.get(token, token)
+
+
+def parse_mount_tokens(raw: Optional[str]) -> List[str]:
+    """Port of parseMountTokens: unique normalized mounts in input order."""
+    if not raw:
+        return []
+    text = re.sub(r'E-Mount', 'E', raw, flags=re.I)
+    text = re.sub(r'M-Mount', 'M', text, flags=re.I)
+    text = re.sub(r'L-Mount', 'L', text, flags=re.I)
+    text = re.sub(r'Mount', '', text, flags=re.I)
+    tokens = [normalize_mount_token(token) for token in re.split(r'[/,+|]', text)]
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
+def normalize_sensor_coverage(raw: Optional[str]) -> str:
+    """Port of normalizeSensorCoverage from lib/camera-format.ts."""
+    if not raw:
+        return ''
+    lower = raw.lower()
+    if 's16' in lower or 'super 16' in lower:
+        return 'S16'
+    if 's35' in lower or 'super 35' in lower:
+        return 'S35'
+    if 'lf' in lower or 'large format' in lower or 'vista vision' in lower:
+        return 'LF'
+    if 'full' in lower or 'ff' in lower:
+        return 'FF'
+    return raw.upper() if raw.upper() in SENSOR_LEVELS else ''
+
+
+def _parse_float(text: str) -> float:
+    """JavaScript parseFloat: leading numeric prefix or NaN."""
+    match = re.match(r'\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?', text)
+    return float(match.group(0)) if match else math.nan
+
+
+def lens_image_circle(row) -> float:
+    """Port of getLensImageCircleMm; NaN when unknown or zero."""
+    try:
+        specs = json.loads(row['specs_json']) if row['specs_json'] else {}
+    except ValueError:
+        specs = {}
+    if not isinstance(specs, dict):
+        specs = {}
+    raw = specs.get('image_circle_mm') or specs.get('imageCircle') or specs.get('image_circle')
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        value = float(raw)
+    elif isinstance(raw, str):
+        value = _parse_float(raw.replace(',', '.', 1))
+    elif isinstance(row['image_circle_mm'], (int, float)):
+        value = float(row['image_circle_mm'])
+    else:
+        value = math.nan
+    return value if value and math.isfinite(value) else math.nan
+
+
+def lens_features(row) -> dict:
+    coverage = normalize_sensor_coverage(row['coverage'])
+    return {
+        'mounts': parse_mount_tokens(row['mount']),
+        'level': SENSOR_LEVELS[coverage] if coverage else -1,
+        'image_circle': lens_image_circle(row),
+    }
+
+
+def camera_features(row) -> dict:
+    coverage = normalize_sensor_coverage(row['sensor_size'] or row['sensor_type'] or row['subcategory'])
+    dims = SENSOR_DIMENSIONS.get(coverage)
+    return {
+        'mounts': parse_mount_tokens(row['mount']),
+        'level': SENSOR_LEVELS[coverage] if coverage else -1,
+        'required_circle': math.hypot(*dims) if dims else math.nan,
+    }
+
+
+def fingerprint(row) -> str:
+    h = hashlib.sha1()
+    for column in FEATURE_COLUMNS:
+        h.update(repr(row[column]).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def load_adapter_pairs(path: str = ADAPTERS_TS) -> List[tuple]:
+    """(lens mount, camera mount) pairs from the adapter table in lib/adapters.ts."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    pairs = re.findall(r"from_mount:\s*'([^']+)',\s*to_mount:\s*'([^']+)'", source)
+    return sorted({(a.upper(), b.upper()) for a, b in pairs})
+
+
+class MountRules:
+    """Pairwise mount rule matrices over a mount vocabulary."""
+
+    def __init__(self, vocab: List[str], adapter_pairs: List[tuple]):
+        size = len(vocab)
+        position = {mount: i for i, mount in enumerate(vocab)}
+        self.impossible = np.zeros((size, size), dtype=np.int32)
+        self.fixable = np.zeros((size, size), dtype=np.int32)
+        for lens_mount, i in position.items():
+            for camera_mount, j in position.items():
+                lens_flange = FLANGE_MM.get(lens_mount)
+                camera_flange = FLANGE_MM.get(camera_mount)
+                if lens_flange and camera_flange and lens_flange < camera_flange:
+                    self.impossible[i, j] = 1
+                if ((lens_mount, camera_mount) in SOLUTION_PAIRS
+                        or (lens_mount, camera_mount) in adapter_pairs
+                        or lens_mount == 'M-MOUNT'):
+                    self.fixable[i, j] = 1
+
+
+def one_hot(items: List[dict], vocab: Dict[str, int]) -> np.ndarray:
+    matrix = np.zeros((len(items), len(vocab)), dtype=np.int32)
+    for row, item in enumerate(items):
+        for mount in item['mounts']:
+            matrix[row, vocab[mount]] = 1
+    return matrix
+
+
+def evaluate(lenses: List[dict], cameras: List[dict], vocab: Dict[str, int],
+             rules: MountRules) -> np.ndarray:
+    """Compatibility codes for every lens (rows) x camera (columns) pair."""
+    L = one_hot(lenses, vocab)
+    C = one_hot(cameras, vocab)
+
+    overlap = (L @ C.T) > 0
+    checked = L.any(axis=1)[:, None] & C.any(axis=1)[None, :]
+    mismatch = checked & ~overlap
+    impossible = (L @ rules.impossible @ C.T) > 0
+    fixable = (L @ rules.fixable @ C.T) > 0
+
+    codes = np.where(
+        mismatch,
+        np.where(impossible, MOUNT_IMPOSSIBLE, np.where(fixable, MOUNT_ADAPTER, MOUNT_NO_ADAPTER)),
+        MOUNT_OK,
+    ).astype(np.uint8)
+
+    lens_level = np.array([item['level'] for item in lenses], dtype=np.int8)[:, None]
+    camera_level = np.array([item['level'] for item in cameras], dtype=np.int8)[None, :]
+    circle = np.array([item['image_circle'] for item in lenses], dtype=np.float64)[:, None]
+    required = np.array([item['required_circle'] for item in cameras], dtype=np.float64)[None, :]
+
+    # Impossible mounts return before the coverage checks in validateCompatibility.
+    covered = (lens_level >= 0) & (camera_level >= 0) & (codes != MOUNT_IMPOSSIBLE)
+    with np.errstate(invalid='ignore'):
+        circle_short = covered & (circle + 0.2 < required)
+    level_short = covered & ~circle_short & (lens_level < camera_level)
+
+    codes |= np.where(circle_short, COVERAGE_IMAGE_CIRCLE, 0).astype(np.uint8)
+    codes |= np.where(level_short, COVERAGE_LEVEL, 0).astype(np.uint8)
+    return codes
+
+
+def describe(code: int) -> str:
+    parts = [MOUNT_LABELS[code & MOUNT_MASK]]
+    if code & COVERAGE_IMAGE_CIRCLE:
+        parts.append('image circle below sensor requirement')
+    if code & COVERAGE_LEVEL:
+        parts.append('coverage may vignette')
+    return ', '.join(parts)
+
+
+def _load_index(out: str) -> Optional[dict]:
+    try:
+        with open(f"{out}.json", 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or not os.path.exists(f"{out}.npy"):
+        return None
+    return index
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.compat.', suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def build(conn: sqlite3.Connection, out: str = DEFAULT_OUT, full: bool = False) -> dict:
+    """Build or incrementally refresh the matrix; return rebuild stats."""
+    adapter_pairs = load_adapter_pairs()
+    rules_digest = hashlib.sha1(json.dumps(adapter_pairs).encode('utf-8')).hexdigest()
+    previous = None if full else _load_index(out)
+    if previous and previous['rules'] != rules_digest:
+        previous = None
+
+    columns = ', '.join(f'"{c}"' for c in ('id', 'category', *FEATURE_COLUMNS))
+    rows = conn.execute(f'''
+        SELECT {columns} FROM "EquipmentItem" WHERE "category" IN ('LNS', 'CAM') ORDER BY rowid
+    ''').fetchall()
+
+    sides = {'LNS': {}, 'CAM': {}}
+    old_items = {'LNS': previous['lenses'] if previous else {}, 'CAM': previous['cameras'] if previous else {}}
+    for row in rows:
+        fp = fingerprint(row)
+        cached = old_items[row['category']].get(row['id'])
+        if cached and cached['fp'] == fp:
+            sides[row['category']][row['id']] = dict(cached, changed=False)
+            continue
+        features = lens_features(row) if row['category'] == 'LNS' else camera_features(row)
+        sides[row['category']][row['id']] = dict(features, fp=fp, changed=True)
+
+    vocab_list = list(previous['vocab']) if previous else []
+    for side in sides.values():
+        for item in side.values():
+            for mount in item['mounts']:
+                if mount not in vocab_list:
+                    vocab_list.append(mount)
+    vocab = {mount: i for i, mount in enumerate(vocab_list)}
+    rules = MountRules(vocab_list, adapter_pairs)
+
+    lens_ids = list(sides['LNS'])
+    camera_ids = list(sides['CAM'])
+    lenses = [sides['LNS'][i] for i in lens_ids]
+    cameras = [sides['CAM'][i] for i in camera_ids]
+
+    lens_old = np.full(len(lens_ids), -1, dtype=np.int64)
+    camera_old = np.full(len(camera_ids), -1, dtype=np.int64)
+    if previous:
+        old_matrix = np.load(f"{out}.npy", mmap_mode='r')
+        for n, (item_id, item) in enumerate(zip(lens_ids, lenses)):
+            if not item['changed']:
+                lens_old[n] = previous['lenses'][item_id]['pos']
+        for n, (item_id, item) in enumerate(zip(camera_ids, cameras)):
+            if not item['changed']:
+                camera_old[n] = previous['cameras'][item_id]['pos']
+
+    matrix = np.zeros((len(lenses), len(cameras)), dtype=np.uint8)
+    keep_l = lens_old >= 0
+    keep_c = camera_old >= 0
+    if keep_l.any() and keep_c.any():
+        matrix[np.ix_(keep_l, keep_c)] = old_matrix[np.ix_(lens_old[keep_l], camera_old[keep_c])]
+    fresh_l = np.flatnonzero(~keep_l)
+    fresh_c = np.flatnonzero(~keep_c)
+    if len(fresh_l) and len(cameras):
+        matrix[fresh_l, :] = evaluate([lenses[i] for i in fresh_l], cameras, vocab, rules)
+    kept_l = np.flatnonzero(keep_l)
+    if len(kept_l) and len(fresh_c):
+        matrix[np.ix_(kept_l, fresh_c)] = evaluate(
+            [lenses[i] for i in kept_l], [cameras[i] for i in fresh_c], vocab, rules)
+
+    def strip(item, pos):
+        item = {k: v for k, v in item.items() if k != 'changed'}
+        item['pos'] = pos
+        return item
+
+    index = {
+        'version': INDEX_VERSION,
+        'rules': rules_digest,
+        'vocab': vocab_list,
+        'lenses': {item_id: strip(item, n) for n, (item_id, item) in enumerate(zip(lens_ids, lenses))},
+        'cameras': {item_id: strip(item, n) for n, (item_id, item) in enumerate(zip(camera_ids, cameras))},
+    }
+    _atomic_write(f"{out}.npy", lambda f: np.save(f, matrix))
+    _atomic_write(f"{out}.json", lambda f: f.write(json.dumps(index).encode('utf-8')))
+    return {
+        'lenses': len(lenses), 'cameras': len(cameras),
+        'lens_rows': len(fresh_l), 'camera_columns': len(fresh_c),
+    }
+
+
+class CompatibilityMatrix:
+    """Read-only, memory-mapped view of a built matrix."""
+
+    def __init__(self, out: str = DEFAULT_OUT):
+        index = _load_index(out)
+        if index is None:
+            raise FileNotFoundError(f"no compatibility matrix at {out}.npy; run with --build")
+        self.lens_pos = {item_id: item['pos'] for item_id, item in index['lenses'].items()}
+        self.camera_pos = {item_id: item['pos'] for item_id, item in index['cameras'].items()}
+        self.matrix = np.load(f"{out}.npy", mmap_mode='r')
+
+    def lookup(self, lens_id: str, camera_id: str) -> Optional[int]:
+        lens = self.lens_pos.get(lens_id)
+        camera = self.camera_pos.get(camera_id)
+        if lens is None or camera is None:
+            return None
+        return int(self.matrix[lens, camera])
+
+
+def check_kit(conn: sqlite3.Connection, matrix: CompatibilityMatrix, kit_id: str) -> List[dict]:
+    """Look up every lens against the camera assigned to the same slot in a kit."""
+    entries = conn.execute('''
+        SELECT k."assignedCam", e."id", e."name", e."category"
+        FROM "KitItem" k JOIN "EquipmentItem" e ON e."id" = k."equipmentId"
+        WHERE k."kitId" = ? AND e."category" IN ('CAM', 'LNS')
+        ORDER BY k."orderIndex"
+    ''', (kit_id,)).fetchall()
+    cameras = {}
+    for entry in entries:
+        if entry['category'] == 'CAM':
+            cameras.setdefault(entry['assignedCam'], entry)
+    results = []
+    for entry in entries:
+        camera = cameras.get(entry['assignedCam'])
+        if entry['category'] != 'LNS' or camera is None:
+            continue
+        code = matrix.lookup(entry['id'], camera['id'])
+        results.append({'cam': entry['assignedCam'], 'lens': entry['name'], 'camera': camera['name'],
+                        'code': code, 'verdict': describe(code) if code is not None else 'not in matrix'})
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('--out', default=DEFAULT_OUT, help='matrix path prefix (default: .cache/compatibility)')
+    parser.add_argument('--build', action='store_true', help='build or incrementally refresh the matrix')
+    parser.add_argument('--full', action='store_true', help='ignore the previous matrix when building')
+    parser.add_argument('--check', nargs=2, metavar=('LENS_ID', 'CAMERA_ID'), help='look up one pair')
+    parser.add_argument('--kit', help='check every lens in a kit against its assigned camera')
+    args = parser.parse_args(argv)
+
+    try:
+        conn = connect(args.db, readonly=True)
+        if args.build or args.full:
+            started = time.perf_counter()
+            stats = build(conn, args.out, full=args.full)
+            print(f"{stats['lenses']} lenses x {stats['cameras']} cameras; re-evaluated "
+                  f"{stats['lens_rows']} lens rows and {stats['camera_columns']} camera columns "
+                  f"({1000 * (time.perf_counter() - started):.1f} ms)", file=sys.stderr)
+        if args.check or args.kit:
+            matrix = CompatibilityMatrix(args.out)
+            if args.check:
+                code = matrix.lookup(*args.check)
+                if code is None:
+                    print("error: lens or camera not in matrix", file=sys.stderr)
+                    return 1
+                print(describe(code))
+            if args.kit:
+                for result in check_kit(conn, matrix, args.kit):
+                    print(f"[{result['cam']}] {result['lens']} on {result['camera']}: {result['verdict']}")
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
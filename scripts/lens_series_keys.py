@@ -0,0 +1,197 @@
+"""Materialized lens-series grouping keys with incremental recompute.
+
+Computes the `Brand-Series` group key for every LNS row (and the model/name
+key the catalog modal uses for SUP filter sets) once and stores it in the
+`_lens_series_keys` table of .cache/lens-series-keys.sqlite, with the catalog
+database ATTACHed read-only, so the tracked prisma/dev.db is never written.
+Two keys are kept per row:
+
+- panel_key: the catalog modal's `getSeriesName` in components/InventoryPanel.tsx;
+- lib_key:   `getLensSeriesName` from lib/lens-series.ts, used for project lists.
+
+Each run only recomputes rows whose name, brand, model or category differ from
+the values stored alongside their keys (the diff is a single SQL join), and
+drops keys for rows that were deleted or left LNS/SUP. Keys are stamped with
+KEY_VERSION; bump it whenever the ports change so every key is recomputed.
+
+    python scripts/lens_series_keys.py             # refresh keys
+    python scripts/lens_series_keys.py --report    # also list panel/lib disagreements
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from catalog_db import CACHE_DIR, add_db_argument, open_sidecar
+
+DEFAULT_CACHE = os.path.join(CACHE_DIR, 'lens-series-keys.sqlite')
+
+TABLE = '_lens_series_keys'
+
+# Version of panel_series_name/lib_series_name; stored keys from another
+# version are recomputed.
+KEY_VERSION = 1
+
+CATEGORIES = ('LNS', 'SUP')
+
+PANEL_CLEANUP = [
+    re.compile(r'\s\d+mm', re.I),            # Remove 50mm
+    re.compile(r'\sT\d+(\.\d+)?', re.I),     # Remove T1.3
+    re.compile(r'\sF\d+(\.\d+)?', re.I),     # Remove F2.8
+    re.compile(r'\s\d+\.?\d*"', re.I),       # Remove 1/4" etc
+]
+
+LIB_FOCAL = re.compile(r'\b\d+(?:[.,]\d+)?\s*mm\b', re.I)
+WHITESPACE = re.compile(r'\s+')
+
+
+def panel_series_name(category: str, name: str, brand: Optional[str], model: Optional[str]) -> str:
+    """Port of `getSeriesName` from the InventoryPanel catalog modal."""
+    if category != 'LNS':
+        return model or name
+    if brand and brand.lower() not in name.lower():
+        name = f"{brand} {name}"
+    for pattern in PANEL_CLEANUP:
+        name = pattern.sub('', name)
+    return name.strip()
+
+
+def lib_series_name(name: Optional[str], brand: Optional[str], model: Optional[str]) -> str:
+    """Port of `getLensSeriesName` from lib/lens-series.ts."""
+    brand = (brand or '').strip()
+    source = (model or name or '').strip()
+    without_brand = source
+    if brand:
+        without_brand = re.sub(rf'^{re.escape(brand)}\s+', '', source, flags=re.I)
+    cleaned = WHITESPACE.sub(' ', LIB_FOCAL.sub(' ', without_brand)).strip()
+    return cleaned or without_brand or source or 'Lens Set'
+
+
+def ensure_table(conn: sqlite3.Connection) -> None:
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{TABLE}" (
+            "item_id" TEXT NOT NULL PRIMARY KEY,
+            "category" TEXT NOT NULL,
+            "name" TEXT NOT NULL,
+            "brand" TEXT,
+            "model" TEXT,
+            "panel_series" TEXT NOT NULL,
+            "panel_key" TEXT NOT NULL,
+            "lib_series" TEXT,
+            "lib_key" TEXT,
+            "version" INTEGER NOT NULL,
+            "computed_at" REAL NOT NULL
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "{TABLE}_panel_key_idx" ON "{TABLE}"("panel_key")')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "{TABLE}_lib_key_idx" ON "{TABLE}"("lib_key")')
+
+
+def refresh(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Recompute keys for new or changed rows and drop stale ones."""
+    ensure_table(conn)
+    placeholders = ', '.join('?' for _ in CATEGORIES)
+    stale = conn.execute(f'''
+        SELECT e."id", e."category", e."name", e."brand", e."model"
+        FROM "catalog"."EquipmentItem" e
+        LEFT JOIN "{TABLE}" k ON k."item_id" = e."id"
+        WHERE e."category" IN ({placeholders})
+          AND (k."item_id" IS NULL
+               OR k."version" IS NOT ?
+               OR k."category" IS NOT e."category"
+               OR k."name" IS NOT e."name"
+               OR k."brand" IS NOT e."brand"
+               OR k."model" IS NOT e."model")
+    ''', (*CATEGORIES, KEY_VERSION)).fetchall()
+
+    now = time.time()
+    rows = []
+    for item in stale:
+        panel_series = panel_series_name(item['category'], item['name'], item['brand'], item['model'])
+        panel_key = f"{item['brand'] or 'Generic'}-{panel_series}"
+        lib_series = lib_key = None
+        if item['category'] == 'LNS':
+            lib_series = lib_series_name(item['name'], item['brand'], item['model'])
+            lib_key = f"{item['brand'] or ''}-{lib_series}"
+        rows.append((item['id'], item['category'], item['name'], item['brand'], item['model'],
+                     panel_series, panel_key, lib_series, lib_key, KEY_VERSION, now))
+
+    with conn:
+        conn.executemany(f'INSERT OR REPLACE INTO "{TABLE}" VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        removed = conn.execute(f'''
+            DELETE FROM "{TABLE}"
+            WHERE "item_id" NOT IN (
+                SELECT "id" FROM "catalog"."EquipmentItem" WHERE "category" IN ({placeholders})
+            )
+        ''', CATEGORIES).rowcount
+    total = conn.execute(f'SELECT COUNT(*) FROM "{TABLE}"').fetchone()[0]
+    return {'recomputed': len(rows), 'removed': removed, 'total': total}
+
+
+def disagreements(conn: sqlite3.Connection) -> List[dict]:
+    """Groups that the panel and lib/lens-series.ts keys partition differently.
+
+    A panel group that spans several lib groups (or the reverse) means the
+    catalog modal and the project list would show the same lenses grouped
+    differently.
+    """
+    panel_to_lib: Dict[str, Set[str]] = defaultdict(set)
+    lib_to_panel: Dict[str, Set[str]] = defaultdict(set)
+    for row in conn.execute(f'SELECT "panel_key", "lib_key" FROM "{TABLE}" WHERE "category" = \'LNS\''):
+        panel_to_lib[row['panel_key']].add(row['lib_key'])
+        lib_to_panel[row['lib_key']].add(row['panel_key'])
+
+    report = []
+    for key, others in sorted(panel_to_lib.items()):
+        if len(others) > 1:
+            report.append({'grouping': 'panel', 'key': key, 'splits_into': sorted(others)})
+    for key, others in sorted(lib_to_panel.items()):
+        if len(others) > 1:
+            report.append({'grouping': 'lib', 'key': key, 'splits_into': sorted(others)})
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help='key database (default: .cache/lens-series-keys.sqlite)')
+    parser.add_argument('--report', action='store_true',
+                        help='list groups where the panel and lib groupings disagree')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        conn = open_sidecar(args.db, args.cache)
+        started = time.perf_counter()
+        stats = refresh(conn)
+        elapsed = time.perf_counter() - started
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"{stats['recomputed']} keys recomputed, {stats['removed']} removed, "
+          f"{stats['total']} stored ({1000 * elapsed:.1f} ms)", file=sys.stderr)
+
+    if args.report:
+        report = disagreements(conn)
+        if args.json:
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            for entry in report:
+                print(f"{entry['grouping']} group {entry['key']!r} splits into:")
+                for other in entry['splits_into']:
+                    print(f"    {other}")
+            print(f"{len(report)} disagreeing groups", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
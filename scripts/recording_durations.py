@@ -0,0 +1,492 @@
+"""Batch recording-duration tables for every camera setup x media combination.
+
+`estimateRecordingDuration` (lib/recording-duration.ts) parses a camera's
+recordingFormats and a media item's capacity on every call. This script parses
+each camera and each media item in the catalog once and resolves every setup to
+a data rate:
+
+- every catalog recording format that states a data rate (source "catalog");
+- every distinct camera configJson saved on a KitItem, resolved with the same
+  verified > custom > catalog > estimate precedence as the TypeScript;
+- setups given with --config, on every camera whose catalog recording formats
+  mention the config's codec (a config without a codec applies to all).
+
+Minutes for all setups x media come from one NumPy outer product. Catalog and
+KitItem setups are stored in the `_recording_setups`, `_recording_media` and
+`_recording_durations` tables of .cache/recording-durations.sqlite (the
+catalog database is ATTACHed read-only as `catalog` and never written), so the
+grid can be queried with SQL or with this script. --config setups are computed
+for that run only and never written there, so a later --refresh cannot drop
+them. Minutes are per single card; --quantity scales capacity like
+mediaQuantity does.
+
+Requires numpy (pip install -r scripts/requirements.txt).
+
+    python scripts/recording_durations.py --refresh
+    python scripts/recording_durations.py --camera "Alexa 35" --min-minutes 30
+    python scripts/recording_durations.py --config '{"codec": "ARRIRAW", "resolutionK": "4.6K"}'
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit('error: numpy is required: pip install -r scripts/requirements.txt')
+
+from catalog_db import CACHE_DIR, add_db_argument, open_sidecar
+
+DEFAULT_CACHE = os.path.join(CACHE_DIR, 'recording-durations.sqlite')
+
+SETUPS_TABLE = '_recording_setups'
+MEDIA_TABLE = '_recording_media'
+DURATIONS_TABLE = '_recording_durations'
+
+OUTPUT_COLUMNS = ('camera', 'label', 'source', 'data_rate_mbps', 'media', 'capacity_gb', 'minutes')
+
+DATA_RATE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(Gbps|Mbps|GB/s|MB/s)', re.I)
+TB_CAPACITY = re.compile(r'(\d+(?:[.,]\d+)?)\s*TB', re.I)
+GB_CAPACITY = re.compile(r'(\d+(?:[.,]\d+)?)\s*GB', re.I)
+RESOLUTION_K = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+# estimateDataRateMbps: (codec substring, rate for a resolution in K).
+ESTIMATED_RATES = (
+    ('arriraw', lambda k, codec: 2800 if k >= 6 else 2600 if k >= 4 else 1200),
+    ('arricore', lambda k, codec: 2600 if k >= 4 else 1200),
+    ('prores 4444 xq', lambda k, codec: 1800 if k >= 4 else 900),
+    ('prores 422 hq', lambda k, codec: 800 if k >= 4 else 250),
+    ('x-ocn xt', lambda k, codec: 2400 if k >= 8 else 2000 if k >= 6 else 1400),
+    ('x-ocn st', lambda k, codec: 1800 if k >= 8 else 1000),
+    ('x-ocn lt', lambda k, codec: 1200 if k >= 6 else 900),
+    ('redcode', lambda k, codec: 2500 if 'hq' in codec else 1500 if 'mq' in codec else 1200),
+    ('braw', lambda k, codec: 1500 if k >= 12 else 900 if k >= 8 else 480),
+    ('xavc-i', lambda k, codec: 600 if k >= 4 else 150),
+    ('cinema raw', lambda k, codec: 2100 if k >= 5 else 1000),
+)
+
+
+def _decimal(text: str) -> float:
+    return float(text.replace(',', '.', 1))
+
+
+def parse_data_rate_mbps(text: Optional[str]) -> Optional[float]:
+    """Port of `parseCameraDataRateMbps`."""
+    if not text:
+        return None
+    match = DATA_RATE.search(text)
+    if not match:
+        return None
+    value = _decimal(match.group(1))
+    unit = match.group(2).lower()
+    return {'gbps': value * 1000, 'mbps': value, 'gb/s': value * 8000, 'mb/s': value * 8}[unit]
+
+
+def parse_media_capacity_gb(name: str, model: Optional[str] = None,
+                            specs_json: Optional[str] = None) -> Optional[float]:
+    """Port of `parseMediaCapacityGb`."""
+    specs_capacity = _capacity_from_specs(specs_json)
+    if specs_capacity:
+        return specs_capacity
+    text = f"{name} {model or ''}"
+    match = TB_CAPACITY.search(text)
+    if match:
+        return _decimal(match.group(1)) * 1000
+    match = GB_CAPACITY.search(text)
+    if match:
+        return _decimal(match.group(1))
+    return None
+
+
+def _first_truthy(specs: dict, keys: Iterable[str]):
+    for key in keys:
+        if specs.get(key):
+            return specs[key]
+    return None
+
+
+def _capacity_from_specs(specs_json: Optional[str]) -> Optional[float]:
+    if not specs_json:
+        return None
+    try:
+        specs = json.loads(specs_json)
+    except ValueError:
+        return None
+    if not isinstance(specs, dict):
+        return None
+    raw_tb = _first_truthy(specs, ('capacity_tb', 'capacityTb', 'size_tb', 'sizeTb'))
+    if isinstance(raw_tb, (int, float)) and not isinstance(raw_tb, bool):
+        return raw_tb * 1000
+    if isinstance(raw_tb, str):
+        return parse_media_capacity_gb(raw_tb)
+    raw = _first_truthy(specs, ('capacity_gb', 'capacityGb', 'capacity', 'size'))
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return raw
+    if isinstance(raw, str):
+        return parse_media_capacity_gb(raw)
+    return None
+
+
+def parse_recording_formats(recording_formats: Optional[str]) -> List[dict]:
+    """Port of `parseRecordingFormats` from lib/recording-duration.ts."""
+    if not recording_formats:
+        return []
+    try:
+        parsed = json.loads(recording_formats)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, list):
+        rows = []
+        for row in parsed:
+            if isinstance(row, str):
+                rows.append({'text': row, 'rate': parse_data_rate_mbps(row)})
+            elif isinstance(row, dict):
+                text = ' '.join(value for value in row.values() if isinstance(value, str))
+                source = row.get('data_rate') or row.get('dataRate') or text
+                rows.append({'text': text, 'rate': parse_data_rate_mbps(str(source))})
+            elif row is not None:
+                rows.append({'text': str(row), 'rate': None})
+        return rows
+    texts = (text.strip() for text in re.split(r'[|;\n]', recording_formats))
+    return [{'text': text, 'rate': parse_data_rate_mbps(text)} for text in texts if text]
+
+
+def parse_custom_data_rate(value) -> Optional[float]:
+    """Port of `parseCustomDataRateMbps`."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value if math.isfinite(value) and value > 0 else None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    with_unit = parse_data_rate_mbps(value)
+    if with_unit:
+        return with_unit
+    try:
+        numeric = _decimal(value.strip())
+    except ValueError:
+        return None
+    return numeric if math.isfinite(numeric) and numeric > 0 else None
+
+
+def _config_text(config: dict, key: str) -> str:
+    value = config.get(key)
+    return value if isinstance(value, str) else ''
+
+
+def score_format_match(text: str, config: dict) -> int:
+    """Port of `scoreFormatMatch`."""
+    haystack = text.lower()
+    score = 0
+    for key, weight in (('codec', 4), ('resolutionK', 3), ('gateMode', 1), ('aspectRatio', 1)):
+        value = _config_text(config, key)
+        if value and value.lower() in haystack:
+            score += weight
+    return score
+
+
+def catalog_data_rate(formats: List[dict], config: dict) -> Optional[float]:
+    """Port of `findCatalogDataRateMbps` over pre-parsed formats."""
+    ranked = sorted(formats, key=lambda row: score_format_match(row['text'], config), reverse=True)
+    for row in ranked:
+        if score_format_match(row['text'], config) > 0 and row['rate']:
+            return row['rate']
+    return None
+
+
+def estimate_data_rate(config: dict) -> Optional[float]:
+    """Port of `estimateDataRateMbps`."""
+    codec = _config_text(config, 'codec').lower()
+    if not codec:
+        return None
+    match = RESOLUTION_K.search(_config_text(config, 'resolutionK'))
+    resolution = _decimal(match.group(1)) if match else 4
+    for marker, rate in ESTIMATED_RATES:
+        if marker in codec:
+            return rate(resolution, codec)
+    return None
+
+
+def setup_label(config: dict) -> str:
+    """Port of `buildSetupLabel`."""
+    if _config_text(config, 'profileLabel'):
+        return config['profileLabel']
+    aspect = _config_text(config, 'aspectRatio')
+    parts = [_config_text(config, 'resolutionK'), _config_text(config, 'gateMode'),
+             f"{aspect} frame" if aspect else '', _config_text(config, 'codec')]
+    return ' / '.join(part for part in parts if part) or 'selected camera setup'
+
+
+def resolve_config(formats: List[dict], config: dict):
+    """(data rate, source) with the precedence of `estimateRecordingDuration`."""
+    configured = parse_custom_data_rate(config.get('dataRateMbps'))
+    if config.get('source') == 'verified':
+        if configured:
+            return configured, 'verified'
+    elif configured:
+        return configured, 'custom'
+    rate = catalog_data_rate(formats, config)
+    if rate:
+        return rate, 'catalog'
+    rate = estimate_data_rate(config)
+    return (rate, 'estimate') if rate else (None, None)
+
+
+def format_capacity(capacity_gb: float) -> str:
+    if capacity_gb >= 1000 and capacity_gb % 1000 == 0:
+        return f"{capacity_gb / 1000:g}TB"
+    if capacity_gb >= 1000:
+        return f"{round(capacity_gb / 1000, 1):g}TB"
+    return f"{math.floor(capacity_gb + 0.5)}GB"
+
+
+def format_duration(minutes: float) -> str:
+    rounded = max(1, math.floor(minutes + 0.5))
+    return f"{rounded // 60}h {rounded % 60}m" if rounded >= 90 else f"{rounded} min"
+
+
+def ensure_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{SETUPS_TABLE}" (
+            "setup_id" INTEGER NOT NULL PRIMARY KEY,
+            "camera_id" TEXT NOT NULL,
+            "label" TEXT NOT NULL,
+            "source" TEXT NOT NULL,
+            "data_rate_mbps" REAL NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{MEDIA_TABLE}" (
+            "media_id" TEXT NOT NULL PRIMARY KEY,
+            "capacity_gb" REAL NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{DURATIONS_TABLE}" (
+            "setup_id" INTEGER NOT NULL,
+            "media_id" TEXT NOT NULL,
+            "minutes" REAL NOT NULL,
+            PRIMARY KEY ("setup_id", "media_id")
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "{SETUPS_TABLE}_camera_idx" ON "{SETUPS_TABLE}"("camera_id")')
+
+
+def records_codec(formats: List[dict], config: dict) -> bool:
+    """Whether a camera's catalog formats mention the config's codec (if it has one)."""
+    codec = _config_text(config, 'codec').lower()
+    return not codec or any(codec in row['text'].lower() for row in formats)
+
+
+def _add_config_setups(setups: List[tuple], seen: set, camera_id: str,
+                       formats: List[dict], configs: Iterable[dict]) -> None:
+    for config in configs:
+        rate, source = resolve_config(formats, config)
+        label = setup_label(config)
+        if rate and (label, source, rate) not in seen:
+            seen.add((label, source, rate))
+            setups.append((camera_id, label, source, rate))
+
+
+def collect_setups(conn: sqlite3.Connection) -> List[tuple]:
+    """(camera id, label, source, data rate) for every catalog and KitItem setup."""
+    kit_configs = {}
+    for row in conn.execute('''
+        SELECT DISTINCT "equipmentId", "configJson" FROM "catalog"."KitItem"
+        WHERE "configJson" IS NOT NULL AND "configJson" != '' AND "equipmentId" IS NOT NULL
+    '''):
+        try:
+            config = json.loads(row['configJson'])
+        except ValueError:
+            continue
+        if isinstance(config, dict):
+            kit_configs.setdefault(row['equipmentId'], []).append(config)
+
+    setups = []
+    for camera in conn.execute('''
+        SELECT "id", "recordingFormats" FROM "catalog"."EquipmentItem" WHERE "category" = 'CAM' ORDER BY rowid
+    '''):
+        formats = parse_recording_formats(camera['recordingFormats'])
+        seen = set()
+        for row in formats:
+            if row['rate'] and row['text'] not in seen:
+                seen.add(row['text'])
+                setups.append((camera['id'], row['text'], 'catalog', row['rate']))
+        _add_config_setups(setups, seen, camera['id'], formats, kit_configs.get(camera['id'], []))
+    return setups
+
+
+def collect_config_setups(conn: sqlite3.Connection, configs: List[dict]) -> List[tuple]:
+    """Like `collect_setups`, for --config setups on the cameras that record their codec."""
+    setups = []
+    for camera in conn.execute('''
+        SELECT "id", "recordingFormats" FROM "catalog"."EquipmentItem" WHERE "category" = 'CAM' ORDER BY rowid
+    '''):
+        formats = parse_recording_formats(camera['recordingFormats'])
+        _add_config_setups(setups, set(), camera['id'], formats,
+                           [config for config in configs if records_codec(formats, config)])
+    return setups
+
+
+def collect_media(conn: sqlite3.Connection) -> List[tuple]:
+    """(media id, capacity GB) for Media/Card items with a parseable capacity.
+
+    The subcategory match is case-sensitive (GLOB, not LIKE), like the panel's
+    `sub.includes('Media') || sub.includes('Card')`.
+    """
+    media = []
+    for row in conn.execute('''
+        SELECT "id", "name", "model", "specs_json" FROM "catalog"."EquipmentItem"
+        WHERE "subcategory" GLOB '*Media*' OR "subcategory" GLOB '*Card*'
+        ORDER BY rowid
+    '''):
+        capacity = parse_media_capacity_gb(row['name'], row['model'], row['specs_json'])
+        if capacity:
+            media.append((row['id'], float(capacity)))
+    return media
+
+
+def duration_grid(setups: List[tuple], media: List[tuple]) -> np.ndarray:
+    """Minutes per single card, one row per setup and one column per media item."""
+    rates = np.array([setup[3] for setup in setups], dtype=np.float64)
+    capacities = np.array([item[1] for item in media], dtype=np.float64)
+    return np.outer(1.0 / rates, capacities) * (8000 / 60)
+
+
+def refresh(conn: sqlite3.Connection) -> dict:
+    """Recompute the full duration grid and replace the cached tables."""
+    ensure_tables(conn)
+    setups = collect_setups(conn)
+    media = collect_media(conn)
+    minutes = duration_grid(setups, media)
+
+    media_ids = [item[0] for item in media]
+    with conn:
+        for table in (DURATIONS_TABLE, SETUPS_TABLE, MEDIA_TABLE):
+            conn.execute(f'DELETE FROM "{table}"')
+        conn.executemany(f'INSERT INTO "{SETUPS_TABLE}" VALUES (?, ?, ?, ?, ?)',
+                         ((n, *setup) for n, setup in enumerate(setups)))
+        conn.executemany(f'INSERT INTO "{MEDIA_TABLE}" VALUES (?, ?)', media)
+        conn.executemany(
+            f'INSERT INTO "{DURATIONS_TABLE}" VALUES (?, ?, ?)',
+            ((n, media_id, value)
+             for n, row in enumerate(minutes.tolist())
+             for media_id, value in zip(media_ids, row)),
+        )
+    return {'setups': len(setups), 'media': len(media), 'cells': int(minutes.size)}
+
+
+def query(conn: sqlite3.Connection, camera: Optional[str] = None, media: Optional[str] = None,
+          min_minutes: float = 0, quantity: int = 1) -> List[dict]:
+    """Cached durations, filtered by camera/media id or name substring."""
+    quantity = max(1, quantity)
+    clauses = ['d."minutes" * ? >= ?']
+    params: list = [quantity, min_minutes]
+    for alias, value in (('c', camera), ('m', media)):
+        if value:
+            clauses.append(f'({alias}."id" = ? OR {alias}."name" LIKE ?)')
+            params += [value, f'%{value}%']
+    rows = conn.execute(f'''
+        SELECT c."name" AS "camera", s."label", s."source", s."data_rate_mbps",
+               m."name" AS "media", r."capacity_gb" * ? AS "capacity_gb", d."minutes" * ? AS "minutes"
+        FROM "{DURATIONS_TABLE}" d
+        JOIN "{SETUPS_TABLE}" s ON s."setup_id" = d."setup_id"
+        JOIN "{MEDIA_TABLE}" r ON r."media_id" = d."media_id"
+        JOIN "catalog"."EquipmentItem" c ON c."id" = s."camera_id"
+        JOIN "catalog"."EquipmentItem" m ON m."id" = d."media_id"
+        WHERE {' AND '.join(clauses)}
+        ORDER BY c.rowid, s."setup_id", m.rowid
+    ''', (quantity, quantity, *params))
+    return [dict(row) for row in rows]
+
+
+def _matches(value: Optional[str], item_id: str, name: str) -> bool:
+    return not value or value == item_id or value.lower() in name.lower()
+
+
+def query_configs(conn: sqlite3.Connection, configs: List[dict], camera: Optional[str] = None,
+                  media: Optional[str] = None, min_minutes: float = 0, quantity: int = 1) -> List[dict]:
+    """Durations for --config setups, computed in memory for this query only."""
+    quantity = max(1, quantity)
+    names = dict(conn.execute('''
+        SELECT "id", "name" FROM "catalog"."EquipmentItem"
+        WHERE "category" = 'CAM' OR "subcategory" GLOB '*Media*' OR "subcategory" GLOB '*Card*'
+    ''').fetchall())
+    setups = [setup for setup in collect_config_setups(conn, configs)
+              if _matches(camera, setup[0], names[setup[0]])]
+    items = [item for item in collect_media(conn) if _matches(media, item[0], names[item[0]])]
+    if not setups or not items:
+        return []
+    rows = []
+    for setup, minutes in zip(setups, (duration_grid(setups, items) * quantity).tolist()):
+        for (media_id, capacity), value in zip(items, minutes):
+            if value >= min_minutes:
+                rows.append({'camera': names[setup[0]], 'label': setup[1], 'source': setup[2],
+                             'data_rate_mbps': setup[3], 'media': names[media_id],
+                             'capacity_gb': capacity * quantity, 'minutes': value})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_db_argument(parser)
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help='duration grid database (default: .cache/recording-durations.sqlite)')
+    parser.add_argument('--refresh', action='store_true', help='recompute the cached grid first')
+    parser.add_argument('--config', action='append', default=[], metavar='JSON',
+                        help='extra camera setup (configJson format) for the cameras that record its '
+                             'codec; computed for this run only, never cached; repeatable')
+    parser.add_argument('--camera', help='camera id or name substring')
+    parser.add_argument('--media', help='media id or name substring')
+    parser.add_argument('--min-minutes', type=float, default=0)
+    parser.add_argument('--quantity', type=int, default=1, help='cards per camera (default: 1)')
+    parser.add_argument('--format', choices=('text', 'json', 'csv'), default='text')
+    args = parser.parse_args(argv)
+
+    try:
+        extra_configs = [json.loads(config) for config in args.config]
+    except ValueError as exc:
+        print(f"error: invalid --config: {exc}", file=sys.stderr)
+        return 2
+
+    try:
+        conn = open_sidecar(args.db, args.cache)
+        cached = conn.execute('SELECT 1 FROM "main".sqlite_master WHERE "name" = ?', (DURATIONS_TABLE,)).fetchone()
+        if args.refresh or not cached:
+            started = time.perf_counter()
+            stats = refresh(conn)
+            print(f"{stats['setups']} setups x {stats['media']} media = {stats['cells']} durations "
+                  f"({1000 * (time.perf_counter() - started):.1f} ms)", file=sys.stderr)
+        rows = query(conn, args.camera, args.media, args.min_minutes, args.quantity)
+        if extra_configs:
+            rows += query_configs(conn, extra_configs, args.camera, args.media,
+                                  args.min_minutes, args.quantity)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            source = 'approx' if row['source'] == 'estimate' else row['source']
+            print(f"{row['camera']} | {row['media']} | {format_capacity(row['capacity_gb'])} -> "
+                  f"{format_duration(row['minutes'])} {source} @ {row['label']} "
+                  f"({math.floor(row['data_rate_mbps'] + 0.5)} Mbps)")
+    print(f"{len(rows)} durations", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""Content-addressed snapshot store for patched sources and checkpoints.
+
+Replaces full-copy backups (`InventoryPanel.tsx.bak*`, `backups/checkpoint_*`)
+with snapshots of a set of files. Every file is split into chunks:
+
+- text files on line boundaries chosen by a hash of the line itself, so an
+  edit only changes the chunks around it and the rest still dedup; no chunk
+  exceeds 64 KiB, so very long lines (minified files) are cut inside the line;
+- binary files (e.g. prisma/dev.db) in fixed 4 KiB blocks, matching the
+  SQLite page size, so only rewritten pages are new.
+
+Chunks are zlib-compressed and stored once under .snapshots/objects by sha256.
+A snapshot is a small JSON manifest listing each file's chunks and the base
+directory its names are relative to, which is where `restore` writes them
+back unless --dest is given. Files whose
+size and mtime match the last snapshot are not read again. Disk use and
+snapshot time therefore follow what changed, not the number of snapshots.
+
+    python snapshot_store.py snapshot components/InventoryPanel.tsx --label before-fix
+    python snapshot_store.py snapshot backups/checkpoint_20260130_2102 --base backups/checkpoint_20260130_2102
+    python snapshot_store.py snapshot components/InventoryPanel.tsx.bak2 --as components/InventoryPanel.tsx
+    python snapshot_store.py list
+    python snapshot_store.py restore 3f2a9c components/InventoryPanel.tsx
+    python snapshot_store.py drop 3f2a9c
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE = os.path.join(ROOT_DIR, '.snapshots')
+
+BLOCK_SIZE = 4096
+MIN_CHUNK = 1024
+MAX_CHUNK = 64 * 1024
+# A line ends a chunk when the low bits of its crc32 are zero: ~1 in 64 lines.
+BOUNDARY_MASK = 0x3F
+COMPRESS_LEVEL = 6
+
+
+class SnapshotError(Exception):
+    """Raised for unknown or ambiguous snapshots and corrupt objects."""
+
+
+def chunk(data: bytes) -> List[bytes]:
+    """Split `data` into content-defined chunks (see module docstring)."""
+    if b'\0' in data[:8192]:
+        return [data[i:i + BLOCK_SIZE] for i in range(0, len(data), BLOCK_SIZE)]
+    chunks = []
+    start = pos = 0
+    for line in data.splitlines(keepends=True):
+        pos += len(line)
+        while pos - start > MAX_CHUNK:
+            chunks.append(data[start:start + MAX_CHUNK])
+            start += MAX_CHUNK
+        size = pos - start
+        if size == MAX_CHUNK or (size >= MIN_CHUNK and zlib.crc32(line) & BOUNDARY_MASK == 0):
+            chunks.append(data[start:pos])
+            start = pos
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+@dataclass
+class Snapshot:
+    id: str
+    created: str
+    label: str = ''
+    files: Dict[str, dict] = field(default_factory=dict)
+    base: Optional[str] = None     # None for snapshots taken before bases were recorded
+
+    @property
+    def size(self) -> int:
+        return sum(entry['size'] for entry in self.files.values())
+
+    def describe(self) -> str:
+        label = f"  {self.label}" if self.label else ''
+        return f"{self.id}  {self.created}  {len(self.files)} files, {self.size} bytes{label}"
+
+
+class SnapshotStore:
+    """Chunk objects, snapshot manifests and a stat cache under one directory.
+
+    File names in snapshots are relative to `base` (posix separators) when the
+    file lives under it, absolute otherwise. Each snapshot records the base it
+    was taken with, and restores resolve names against that base.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE, base: str = ROOT_DIR):
+        self.root = root
+        self.base = os.path.abspath(base)
+        self.objects_dir = os.path.join(root, 'objects')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+        self.cache_path = os.path.join(root, 'stat-cache.json')
+        self._cache: Optional[dict] = None
+
+    # -- objects ---------------------------------------------------------
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            _write_atomic(path, zlib.compress(data, COMPRESS_LEVEL))
+        return digest
+
+    def _get(self, digest: str) -> bytes:
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error) as exc:
+            raise SnapshotError(f"missing or corrupt object {digest}: {exc}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise SnapshotError(f"object {digest} does not match its hash")
+        return data
+
+    # -- stat cache ------------------------------------------------------
+
+    def _load_cache(self) -> dict:
+        if self._cache is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self) -> None:
+        if self._cache is not None:
+            _write_atomic(self.cache_path, json.dumps(self._cache, sort_keys=True).encode('utf-8'))
+
+    def _cached_entry(self, path: str, st: os.stat_result) -> Optional[dict]:
+        entry = self._load_cache().get(path)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry
+        return None
+
+    def _unchanged(self, path: str, entry: dict) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry['size']:
+            return False
+        cached = self._cached_entry(path, st)
+        if cached:
+            return cached['sha256'] == entry['sha256']
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest() == entry['sha256']
+
+    def _remember(self, path: str, entry: dict) -> None:
+        st = os.stat(path)
+        self._load_cache()[path] = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+    # -- snapshots -------------------------------------------------------
+
+    def name_of(self, path: str, base: Optional[str] = None) -> str:
+        path = os.path.abspath(path)
+        base = base or self.base
+        if path.startswith(base + os.sep):
+            return os.path.relpath(path, base).replace(os.sep, '/')
+        return path
+
+    def path_of(self, name: str, dest: Optional[str] = None, base: Optional[str] = None) -> str:
+        if os.path.isabs(name):
+            return name if dest is None else os.path.join(dest, name.lstrip('/'))
+        return os.path.join(dest or base or self.base, *name.split('/'))
+
+    def add_file(self, path: str) -> dict:
+        """Store `path` and return its manifest entry."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        cached = self._cached_entry(path, st)
+        if cached:
+            return {k: cached[k] for k in ('size', 'mode', 'sha256', 'chunks')}
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = {
+            'size': len(data),
+            'mode': st.st_mode & 0o7777,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'chunks': [self._put(part) for part in chunk(data)],
+        }
+        self._remember(path, entry)
+        return entry
+
+    def snapshot(self, paths: Iterable[str], label: str = '',
+                 names: Optional[Dict[str, str]] = None) -> Snapshot:
+        """Snapshot files (directories are walked); missing paths are skipped.
+
+        `names` maps a path to the name it is recorded under, e.g. a .bak copy
+        recorded as the file it backs up.
+        """
+        names = {os.path.abspath(k): v for k, v in (names or {}).items()}
+        files = {}
+        for path in _walk(paths):
+            files[names.get(path) or self.name_of(path)] = self.add_file(path)
+        created = datetime.datetime.now().isoformat(timespec='milliseconds')
+        body = json.dumps({'created': created, 'label': label, 'base': self.base, 'files': files},
+                          sort_keys=True)
+        snapshot = Snapshot(hashlib.sha256(body.encode('utf-8')).hexdigest()[:12], created, label, files,
+                            self.base)
+        _write_atomic(os.path.join(self.snapshots_dir, f"{snapshot.id}.json"), body.encode('utf-8'))
+        self._save_cache()
+        return snapshot
+
+    def list(self) -> List[Snapshot]:
+        try:
+            ids = [name[:-5] for name in os.listdir(self.snapshots_dir) if name.endswith('.json')]
+        except FileNotFoundError:
+            return []
+        return sorted((self.load(i) for i in ids), key=lambda s: (s.created, s.id))
+
+    def load(self, snapshot_id: str) -> Snapshot:
+        try:
+            with open(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise SnapshotError(f"cannot read snapshot {snapshot_id}: {exc}")
+        return Snapshot(snapshot_id, data['created'], data.get('label', ''), data['files'], data.get('base'))
+
+    def resolve(self, prefix: str) -> Snapshot:
+        """Load a snapshot by id or unique id prefix ('latest' for the newest)."""
+        snapshots = self.list()
+        if prefix == 'latest' and snapshots:
+            return snapshots[-1]
+        matches = [s for s in snapshots if s.id.startswith(prefix)]
+        if len(matches) != 1:
+            problem = 'no snapshot' if not matches else f"{len(matches)} snapshots"
+            raise SnapshotError(f"{problem} matching {prefix!r}")
+        return matches[0]
+
+    def read(self, snapshot: Snapshot, name: str) -> bytes:
+        entry = snapshot.files[name]
+        data = b''.join(self._get(digest) for digest in entry['chunks'])
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise SnapshotError(f"{name} in {snapshot.id} does not match its hash")
+        return data
+
+    def restore(self, snapshot_id: str, files: Optional[List[str]] = None,
+                dest: Optional[str] = None) -> Dict[str, str]:
+        """Write files of a snapshot back; return {name: 'restored' | 'unchanged'}.
+
+        Relative names are written under `dest`, or else under the base the
+        snapshot was taken with (the store's base for snapshots that predate
+        recorded bases). `files` are names or paths; by default every file is
+        restored. Targets whose content already matches are left alone.
+        """
+        snapshot = self.resolve(snapshot_id)
+        wanted = list(snapshot.files)
+        if files:
+            wanted = [f if f in snapshot.files else self.name_of(f, snapshot.base) for f in files]
+            unknown = [f for f in wanted if f not in snapshot.files]
+            if unknown:
+                raise SnapshotError(f"not in snapshot {snapshot.id}: {', '.join(unknown)}")
+
+        outcome = {}
+        for name in wanted:
+            entry = snapshot.files[name]
+            path = os.path.abspath(self.path_of(name, dest, snapshot.base))
+            if self._unchanged(path, entry):
+                outcome[name] = 'unchanged'
+                continue
+            _write_atomic(path, self.read(snapshot, name), entry['mode'])
+            self._remember(path, entry)
+            outcome[name] = 'restored'
+        self._save_cache()
+        return outcome
+
+    def drop(self, snapshot_id: str) -> Snapshot:
+        snapshot = self.resolve(snapshot_id)
+        os.unlink(os.path.join(self.snapshots_dir, f"{snapshot.id}.json"))
+        return snapshot
+
+    def gc(self) -> tuple:
+        """Delete objects no snapshot references; return (objects, bytes) freed."""
+        live = {digest for s in self.list() for entry in s.files.values() for digest in entry['chunks']}
+        removed = freed = 0
+        for directory, _, names in os.walk(self.objects_dir):
+            for name in names:
+                digest = os.path.basename(directory) + name
+                if digest not in live:
+                    path = os.path.join(directory, name)
+                    freed += os.path.getsize(path)
+                    os.unlink(path)
+                    removed += 1
+        if removed:
+            # Cached entries may point at deleted chunks; files get re-read next time.
+            self._cache = {}
+            self._save_cache()
+        return removed, freed
+
+    def disk_usage(self) -> tuple:
+        count = size = 0
+        for directory, _, names in os.walk(self.objects_dir):
+            for name in names:
+                count += 1
+                size += os.path.getsize(os.path.join(directory, name))
+        return count, size
+
+
+def _walk(paths: Iterable[str]) -> List[str]:
+    found = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for directory, dirs, names in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(directory, name) for name in sorted(names))
+        elif os.path.isfile(path):
+            found.append(path)
+    return found
+
+
+def _write_atomic(path: str, data: bytes, mode: Optional[int] = None) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--store', default=DEFAULT_STORE, help='store directory (default: .snapshots)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    take = commands.add_parser('snapshot', help='snapshot files or directories')
+    take.add_argument('paths', nargs='+')
+    take.add_argument('--label', default='')
+    take.add_argument('--base', default=ROOT_DIR,
+                      help='record names relative to this directory (default: repo root)')
+    take.add_argument('--as', dest='as_name', metavar='NAME',
+                      help='record a single file under another name, e.g. a .bak as its original')
+
+    commands.add_parser('list', help='list snapshots, oldest first')
+
+    show = commands.add_parser('show', help='list the files of a snapshot')
+    show.add_argument('snapshot')
+
+    restore = commands.add_parser('restore', help='restore a snapshot or some of its files')
+    restore.add_argument('snapshot', help="snapshot id, unique prefix or 'latest'")
+    restore.add_argument('files', nargs='*')
+    restore.add_argument('--dest', help='restore under this directory instead of the snapshot base')
+
+    drop = commands.add_parser('drop', help='delete a snapshot and unreferenced objects')
+    drop.add_argument('snapshot')
+
+    args = parser.parse_args(argv)
+    store = SnapshotStore(args.store, getattr(args, 'base', ROOT_DIR))
+
+    try:
+        if args.command == 'snapshot':
+            names = None
+            if args.as_name:
+                if len(args.paths) != 1 or not os.path.isfile(args.paths[0]):
+                    parser.error('--as needs exactly one file')
+                names = {args.paths[0]: args.as_name}
+            started = time.perf_counter()
+            before = store.disk_usage()[1]
+            snapshot = store.snapshot(args.paths, args.label, names)
+            added = store.disk_usage()[1] - before
+            print(snapshot.describe())
+            print(f"{added} bytes of new objects ({1000 * (time.perf_counter() - started):.1f} ms)",
+                  file=sys.stderr)
+        elif args.command == 'list':
+            for snapshot in store.list():
+                print(snapshot.describe())
+            count, size = store.disk_usage()
+            print(f"{count} objects, {size} bytes on disk", file=sys.stderr)
+        elif args.command == 'show':
+            snapshot = store.resolve(args.snapshot)
+            print(f"base: {snapshot.base or store.base}", file=sys.stderr)
+            for name, entry in sorted(snapshot.files.items()):
+                print(f"{entry['sha256'][:12]}  {entry['size']:>10}  {name}")
+        elif args.command == 'restore':
+            started = time.perf_counter()
+            outcome = store.restore(args.snapshot, args.files, args.dest)
+            for name, status in outcome.items():
+                print(f"{name}: {status}")
+            print(f"{len(outcome)} files ({1000 * (time.perf_counter() - started):.1f} ms)", file=sys.stderr)
+        elif args.command == 'drop':
+            snapshot = store.drop(args.snapshot)
+            removed, freed = store.gc()
+            print(f"dropped {snapshot.id}; removed {removed} objects ({freed} bytes)")
+    except (OSError, SnapshotError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""pytest setup for the Python tools (the TypeScript suite runs under vitest).
+
+The tools are plain scripts rather than a package, so put the repository root
+and scripts/ on sys.path the way running them directly would.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, 'scripts')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,239 @@
+import json
+import sqlite3
+
+import pytest
+
+from bulk_import_inventory import (
+    EquipmentWriter,
+    canonicalize_header,
+    main,
+    map_headers,
+    parse_import_row,
+    parse_locale_number,
+    read_csv_rows,
+)
+from catalog_db import connect
+
+COLUMNS = ('id', 'name', 'brand', 'model', 'category', 'description', 'daily_rate_est', 'mount',
+           'weight_kg', 'power_draw_w', 'recordingFormats', 'technicalData', 'labMetrics', 'status',
+           'isVerified', 'createdAt', 'updatedAt')
+
+
+def write_csv(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def rows_of(path):
+    _, issues, rows = read_csv_rows(path)
+    return issues, [row for _, row in rows]
+
+
+@pytest.mark.parametrize('raw, integer, expected', [
+    ('1.500', True, 1500),
+    ('2,9', False, 2.9),
+    ('1.234,5', False, 1234.5),
+    ('1,234.5', False, 1234.5),
+    ('98', True, 98),
+    ('1.5', False, 1.5),
+    ('12,5 kg', False, 12.5),
+    ('abc', True, None),
+    ('-', False, None),
+])
+def test_parse_locale_number(raw, integer, expected):
+    assert parse_locale_number(raw, integer) == expected
+
+
+def test_headers_are_canonicalized_and_aliased():
+    assert canonicalize_header('﻿RecordingFormats') == 'recording_formats'
+    assert canonicalize_header(' Daily Rate (TL) ') == 'daily_rate_tl'
+    headers, issues = map_headers(['Brand', 'Model Name', 'Title', 'recordingFormats', 'Gunluk Ucret', '', 'title'])
+    assert headers[:4] == ['brand', 'model', 'name', 'recordingFormats']
+    assert headers[5] == '__empty_6'
+    assert {i['field'] for i in issues} == {'header_6', 'name'}
+
+
+def test_parses_quoted_commas_and_multiline_values(tmp_path):
+    path = write_csv(tmp_path / 'quoted.csv', [
+        'brand,model,name,description',
+        '"ARRI","ALEXA 35","ARRI Alexa 35","Body, with comma"',
+        '"Cooke","S4/i","Cooke 50","Line 1',
+        'Line 2"',
+    ])
+    issues, rows = rows_of(path)
+    assert [i for i in issues if i['level'] == 'error'] == []
+    assert len(rows) == 2
+    assert rows[0]['description'] == 'Body, with comma'
+    assert 'Line 1\nLine 2' in rows[1]['description']
+
+
+def test_detects_semicolon_delimited_csv(tmp_path):
+    path = write_csv(tmp_path / 'semicolon.csv', [
+        'brand;model;name;category;daily_rate_est',
+        'ARRI;ALEXA 35;ARRI Alexa 35;Camera;1.500',
+    ])
+    _, rows = rows_of(path)
+    assert len(rows) == 1
+    assert rows[0]['brand'] == 'ARRI'
+    assert rows[0]['daily_rate_est'] == '1.500'
+
+
+def test_reads_cells_larger_than_the_csv_default_limit(tmp_path):
+    notes = json.dumps({'notes': 'x' * 300_000}).replace('"', '""')
+    path = write_csv(tmp_path / 'large.csv', ['brand,model,name,lab_metrics', f'A,B,C,"{notes}"'])
+    _, rows = rows_of(path)
+    assert len(rows[0]['labMetrics']) > 300_000
+
+
+def test_maps_camera_rows_and_converts_plain_text_json_fields():
+    item, issues = parse_import_row({
+        'brand': 'ARRI', 'model': 'ALEXA 35', 'name': 'ARRI Alexa 35', 'category': 'Camera',
+        'recordingFormats': '4.6K ARRIRAW | 4K ProRes',
+        'technicalData': '17 stops dynamic range',
+        'labMetrics': 'base iso 800',
+    }, 2)
+    assert item is not None
+    assert item['data']['category'] == 'CAM'
+    assert item['data']['daily_rate_est'] == 500
+    assert json.loads(item['data']['recordingFormats']) == [{'format': '4.6K ARRIRAW'}, {'format': '4K ProRes'}]
+    assert item['data']['technicalData'] and item['data']['labMetrics']
+    warnings = {i['field'] for i in issues if i['level'] == 'warning'}
+    assert 'recordingFormats' not in warnings
+    assert {'technicalData', 'labMetrics'} <= warnings
+
+
+def test_returns_error_when_required_fields_are_missing():
+    item, issues = parse_import_row({'category': 'Lens', 'name': 'Cooke S4/i 50mm'}, 5)
+    assert item is None
+    errors = {i['field'] for i in issues if i['level'] == 'error'}
+    assert {'brand', 'model'} <= errors
+
+
+def test_falls_back_to_sup_when_category_is_unknown():
+    item, issues = parse_import_row(
+        {'brand': 'Generic', 'model': 'X1', 'name': 'Mystery Item', 'category': 'UnknownCategory'}, 7)
+    assert item['category'] == 'SUP'
+    assert any(i['level'] == 'warning' and i['field'] == 'category' for i in issues)
+
+
+def test_parses_locale_numeric_formats_for_integer_and_float_fields():
+    item, _ = parse_import_row({
+        'brand': 'ARRI', 'model': 'ALEXA Mini LF', 'name': 'ARRI Alexa Mini LF', 'category': 'Camera',
+        'daily_rate_est': '1.500', 'power_draw_w': '98', 'weight_kg': '2,9',
+    }, 9)
+    assert item['data']['daily_rate_est'] == 1500
+    assert item['data']['power_draw_w'] == 98
+    assert item['data']['weight_kg'] == 2.9
+
+
+def create_catalog(path):
+    conn = sqlite3.connect(path)
+    columns = ', '.join(f'"{c}"' for c in COLUMNS)
+    conn.execute(f'CREATE TABLE "EquipmentItem" ({columns})')
+    return conn
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / 'catalog.db')
+    conn = create_catalog(path)
+    conn.execute('INSERT INTO "EquipmentItem" ("id", "name", "brand", "model", "category", "description", '
+                 '"daily_rate_est", "mount") VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                 ('alexa', 'ARRI Alexa 35', 'ARRI', 'Alexa 35', 'CAM', 'original', 500, 'LPL'))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def item(name, brand='ARRI', model='Alexa 35', **data):
+    return {'row': 0, 'category': 'CAM',
+            'data': dict(name=name, brand=brand, model=model, category='CAM', daily_rate_est=500, **data)}
+
+
+def stored(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT "name", "brand", "model", "description", "mount", "daily_rate_est" '
+                            'FROM "EquipmentItem" ORDER BY "brand", "model", "name"').fetchall()
+    finally:
+        conn.close()
+
+
+def write(path, items, dry_run=False):
+    conn = connect(path)
+    writer = EquipmentWriter(conn, dry_run)
+    try:
+        writer.write(items)
+    finally:
+        writer.close()
+        conn.close()
+    return writer.counts
+
+
+def test_writer_inserts_updates_and_skips_unchanged_rows(db):
+    counts = write(db, [
+        item('ARRI Alexa 35', description='original', mount='LPL'),
+        item('ARRI Alexa 35 Xtreme', model='Alexa 35 Xtreme', description='new'),
+    ])
+    assert counts == {'insert': 1, 'update': 0, 'unchanged': 1}
+    assert write(db, [item('ARRI Alexa 35', description='changed')]) == {'insert': 0, 'update': 1, 'unchanged': 0}
+    assert stored(db) == [
+        ('ARRI Alexa 35', 'ARRI', 'Alexa 35', 'changed', 'LPL', 500),
+        ('ARRI Alexa 35 Xtreme', 'ARRI', 'Alexa 35 Xtreme', 'new', None, 500),
+    ]
+
+
+def test_dry_run_counts_without_writing(db):
+    before = stored(db)
+    assert write(db, [item('ARRI Alexa 35', description='changed')], dry_run=True)['update'] == 1
+    assert stored(db) == before
+
+
+def test_repeated_keys_in_a_batch_apply_in_row_order(db):
+    counts = write(db, [
+        item('ARRI Alexa 35', description='first', mount='M1'),
+        item('ARRI Alexa 35', description='second'),
+        item('ARRI Alexa 35', description='third', mount='M3'),
+        item('ARRI Alexa 35', description='original', mount='LPL'),
+        item('New Body', model='N1', description='a', mount='X'),
+        item('New Body', model='N1', description='b'),
+    ])
+    assert counts == {'insert': 1, 'update': 5, 'unchanged': 0}
+    assert stored(db) == [
+        ('ARRI Alexa 35', 'ARRI', 'Alexa 35', 'original', 'LPL', 500),
+        ('New Body', 'ARRI', 'N1', 'b', 'X', 500),
+    ]
+    write(db, [item('ARRI Alexa 35', description='x'), item('ARRI Alexa 35', description='third', mount='M3')])
+    assert stored(db)[0] == ('ARRI Alexa 35', 'ARRI', 'Alexa 35', 'third', 'M3', 500)
+
+
+def test_temporary_key_index_is_dropped(db):
+    write(db, [item('ARRI Alexa 35', description='changed')])
+    conn = sqlite3.connect(db)
+    assert conn.execute('PRAGMA index_list("EquipmentItem")').fetchall() == []
+    conn.close()
+
+
+def test_parallel_parsing_matches_serial(tmp_path):
+    lines = ['brand;model;name;category;description;daily_rate_est;weight_kg']
+    for n in range(60):
+        lines.append(f'Brand{n % 23 % 5};M{n % 23};Item {n % 23};{"Camera" if n % 2 else "Lens"};'
+                     f'row {n};{n}.000;{n},5')
+    lines.append(';missing;Broken;Camera;;;')
+    csv_path = write_csv(tmp_path / 'inventory.csv', lines)
+
+    results = []
+    for jobs in ('1', '3'):
+        db = str(tmp_path / f'catalog-{jobs}.db')
+        create_catalog(db).close()
+        issues = str(tmp_path / f'issues-{jobs}.csv')
+        assert main(['--db', db, csv_path, '--issues', issues, '--jobs', jobs,
+                     '--chunk-size', '4', '--batch-size', '10']) == 0
+        conn = sqlite3.connect(db)
+        rows = conn.execute('SELECT "name", "brand", "model", "category", "description", '
+                            '"daily_rate_est", "weight_kg" FROM "EquipmentItem" ORDER BY rowid').fetchall()
+        conn.close()
+        with open(issues, encoding='utf-8') as f:
+            results.append((rows, f.read()))
+    assert results[0] == results[1]
+    assert len(results[0][0]) == 23
@@ -0,0 +1,190 @@
+import sqlite3
+from functools import cmp_to_key
+from itertools import product
+
+import pytest
+
+from catalog_query import SUPPORT_SUBCATEGORIES, CatalogIndex, CatalogQuery
+
+COLUMNS = ('id', 'name', 'brand', 'model', 'category', 'subcategory', 'sensor_size', 'coverage', 'parentId')
+
+ITEMS = [
+    ('alexa35', 'ARRI Alexa 35', 'ARRI', 'Alexa 35', 'CAM', 'Cinema', 'S35', None, None),
+    ('minilf', 'ARRI Alexa Mini LF', 'ARRI', 'Alexa Mini LF', 'CAM', 'Cinema', 'LF', None, None),
+    ('venice', 'Sony Venice 2', 'Sony', 'Venice 2', 'CAM', 'Cinema', 'FF', None, None),
+    ('fx6', 'Sony FX6', 'sony', None, 'CAM', 'Cinema', 'FF', None, None),
+    ('komodo', 'RED Komodo', 'RED', 'Komodo', 'CAM', 'Cinema', 'S35', None, None),
+    ('ext', 'RED Extension Cable', 'RED', 'EXT', 'CAM', 'Extension Cable', None, None, None),
+    ('alexa-child', 'ARRI Alexa 35 Body', 'ARRI', 'Alexa 35', 'CAM', 'Cinema', 'S35', None, 'alexa35'),
+    ('k35', 'Canon K35 50mm', 'Canon', 'K35', 'LNS', 'Prime', None, 'FF', None),
+    ('baltar', 'Bausch Baltar 35mm', 'Bausch & Lomb', None, 'LNS', 'Prime', None, 'S35', None),
+    ('vintage-sub', 'Lomo Round Front 50mm', 'Lomo', 'Round Front', 'LNS', 'Vintage', None, 'S35', None),
+    ('s4', 'Cooke S4/i 50mm', 'Cooke', 'S4/i', 'LNS', 'Prime', None, 'S35', None),
+    ('s4-dup', 'Cooke S4/i 32mm', 'Cooke', 'S4/i', 'LNS', 'Prime', None, 'S35', None),
+    ('signature', 'ARRI Signature Prime 40mm', 'ARRI', 'Signature Prime', 'LNS', 'Prime', None, 'LF', None),
+    ('zoom', 'Angenieux Optimo 24-290', 'Angenieux', 'Optimo', 'LNS', 'Zoom', None, 'S35', None),
+    ('ext-lens', 'Lens Extension', 'Cooke', None, 'LNS', 'Extension', None, 'FF', None),
+    ('nd', 'Tiffen ND Filter Set', 'Tiffen', 'ND', 'SUP', 'Filters', None, None, None),
+    ('vlock', 'Core SWX V-Lock Battery', 'Core SWX', None, 'SUP', 'Batteries', None, None, None),
+    ('codex', 'Codex Drive 1TB', 'Codex', 'Compact Drive', 'SUP', 'Recording Media', None, None, None),
+    ('cfast', 'SanDisk CFast Card', 'SanDisk', None, 'SUP', 'Memory Card', None, None, None),
+    ('scorecard', 'Scorecard Slate', 'Generic', None, 'SUP', 'scorecard', None, None, None),
+    ('mattebox', 'ARRI LMB-6', 'ARRI', 'LMB-6', 'SUP', 'matte box', None, None, None),
+    ('fiz', 'Tilta Nucleus FIZ', 'Tilta', None, 'SUP', 'FIZ', None, None, None),
+    ('follow', 'ARRI Follow Focus', 'ARRI', 'FF-5', 'SUP', 'Follow Focus', None, None, None),
+    ('teradek', 'Teradek Bolt 6', 'Teradek', 'Bolt 6', 'SUP', 'Wireless Video', None, None, None),
+    ('tx', 'Hollyland Transmitter', None, None, 'SUP', 'Transmitter', None, None, None),
+    ('head', 'OConnor 2575', 'OConnor', '2575', 'SUP', 'Fluid Head', None, None, None),
+    ('legs', 'Sachtler Legs', 'Sachtler', None, 'SUP', 'Tripod Legs', None, None, None),
+    ('tripod-kit', 'Sachtler Tripod Kit', 'Sachtler', None, 'SUP', 'Tripod Kit', None, None, None),
+    ('mic', 'Sennheiser MKH 416', 'Sennheiser', 'MKH 416', 'SUP', 'Microphone', None, None, None),
+    ('rec', 'Sound Devices MixPre', 'Sound Devices', None, 'SUP', 'Recorder', None, None, None),
+    ('generic', 'Generic Sandbag', 'Generic', None, 'SUP', 'Generic', None, None, None),
+    ('skypanel', 'ARRI SkyPanel S60', 'ARRI', 'SkyPanel S60', 'LIT', 'LED Panel', None, None, None),
+    ('m18', 'ARRI M18', 'ARRI', 'M18', 'LIT', 'HMI', None, None, None),
+    ('gel', 'Rosco Gel Filter', 'Rosco', None, 'LIT', 'Filter Gel', None, None, None),
+    ('ballast', 'ARRI EB Ballast', 'ARRI', None, 'LIT', None, None, None, None),
+]
+
+TABS = ('CAM', 'LNS', 'SUP', 'LIT', 'GRP')
+TECHNICALS = ('ALL', 'S35', 'FF', 'LF', 'Filters', 'Batteries', 'Media', 'Matte Box', 'Focus', 'Wireless',
+              'Support', 'Audio', 'Generic', 'HMI', 'Cinema', 'Missing')
+LENS_TYPES = ('ALL', 'Vintage', 'Prime', 'Zoom', 'Anamorphic')
+COVERAGES = ('ALL', 'FF', 'S35', 'LF', 'MF')
+SEARCHES = ('', '  ', 'arri', 'ARRI alexa', 'SONY', 'cooke s4', 'mm', 'x', 'nothing here')
+
+
+def panel_filter(i, query):
+    """Straight port of the catalog filter callback in fix_inventory_panel.new_code."""
+    if i['category'] != query.tab:
+        return False
+    if i['parentId']:
+        return False
+    search = query.search.lower()
+    if (query.search.strip() and search not in i['name'].lower()
+            and not (i['brand'] is not None and search in i['brand'].lower())):
+        return False
+    if i['subcategory'] in ('Extension', 'Extension Cable'):
+        return False
+    if query.tab == 'CAM' and query.technical != 'ALL':
+        return i['sensor_size'] == query.technical
+    if query.tab == 'LNS':
+        if query.lens_type == 'Vintage':
+            v_check = i['subcategory'] == 'Vintage' or any(
+                marker in i['name'] for marker in ('K35', 'Baltar', 'Panchro', 'Kowa', 'Tribe7', 'Vintage'))
+            if not v_check:
+                return False
+        elif query.lens_type != 'ALL' and i['subcategory'] != query.lens_type:
+            return False
+        if query.coverage != 'ALL' and i['coverage'] != query.coverage:
+            return False
+    if query.tab in ('SUP', 'LIT') and query.technical != 'ALL':
+        sub = i['subcategory'] or ''
+        technical = query.technical
+        if technical == 'Filters':
+            return 'Filter' in sub
+        if technical == 'Batteries':
+            return 'Batter' in sub
+        if technical == 'Media':
+            return 'Media' in sub or 'Card' in sub
+        if technical == 'Matte Box':
+            return 'matte' in sub.lower()
+        if technical == 'Focus':
+            return 'Focus' in sub or 'FIZ' in sub
+        if technical == 'Wireless':
+            return 'Wireless' in sub or 'Transmitter' in sub
+        if technical == 'Support':
+            return sub in SUPPORT_SUBCATEGORIES
+        if technical == 'Audio':
+            return 'Microphone' in sub or 'Recorder' in sub
+        return sub == technical
+    return True
+
+
+def panel_compare(a, b):
+    """Straight port of the catalog sort comparator in fix_inventory_panel.new_code."""
+    brand_a = (a['brand'] or '').lower()
+    brand_b = (b['brand'] or '').lower()
+    if brand_a < brand_b:
+        return -1
+    if brand_a > brand_b:
+        return 1
+    model_a = (a['model'] or '').lower() or a['name'].lower()
+    model_b = (b['model'] or '').lower() or b['name'].lower()
+    if model_a < model_b:
+        return -1
+    if model_a > model_b:
+        return 1
+    return 0
+
+
+def panel_query(rows, query):
+    return sorted((row for row in rows if panel_filter(row, query)), key=cmp_to_key(panel_compare))
+
+
+def queries():
+    for tab, technical, search in product(TABS, TECHNICALS, SEARCHES):
+        if tab == 'LNS':
+            for lens_type, coverage in product(LENS_TYPES, COVERAGES):
+                yield CatalogQuery(tab, technical, lens_type, coverage, search)
+        else:
+            yield CatalogQuery(tab, technical, search=search)
+
+
+def create_catalog(path):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "EquipmentItem" ({})'.format(', '.join(f'"{c}"' for c in COLUMNS)))
+    conn.executemany(f'INSERT INTO "EquipmentItem" VALUES ({", ".join("?" * len(COLUMNS))})', ITEMS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture(scope='module')
+def catalog(tmp_path_factory):
+    return create_catalog(str(tmp_path_factory.mktemp('catalog') / 'catalog.db'))
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return [dict(zip(COLUMNS, item)) for item in ITEMS]
+
+
+def test_matches_the_panel_filter_and_sort(catalog, rows):
+    index = CatalogIndex.cached(catalog, catalog + '.pickle')
+    checked = 0
+    for query in queries():
+        expected = [row['id'] for row in panel_query(rows, query)]
+        assert [row['id'] for row in index.query(query)] == expected, query
+        checked += bool(expected)
+    assert checked > 100
+
+
+def test_every_filter_value_selects_something(catalog):
+    index = CatalogIndex.cached(catalog, catalog + '.pickle')
+    # The last two technical values ('Cinema', 'Missing') deliberately match nothing.
+    for technical in TECHNICALS[1:-2]:
+        tabs = ('CAM',) if technical in ('S35', 'FF', 'LF') else ('SUP', 'LIT')
+        assert any(index.query(CatalogQuery(tab, technical)) for tab in tabs), technical
+    for lens_type in LENS_TYPES[1:-1]:
+        assert index.query(CatalogQuery('LNS', lens_type=lens_type)), lens_type
+    for coverage in COVERAGES[1:-1]:
+        assert index.query(CatalogQuery('LNS', coverage=coverage)), coverage
+
+
+def test_cached_index_is_reused_until_the_database_changes(tmp_path):
+    catalog = create_catalog(str(tmp_path / 'catalog.db'))
+    cache = str(tmp_path / 'index.pickle')
+    first = CatalogIndex.cached(catalog, cache)
+    second = CatalogIndex.cached(catalog, cache)
+    assert second is not first
+    assert second.query(CatalogQuery('LNS', search='cooke')) == first.query(CatalogQuery('LNS', search='cooke'))
+
+    conn = sqlite3.connect(catalog)
+    conn.execute('UPDATE "EquipmentItem" SET "name" = ? WHERE "id" = ?', ('Cooke S4/i 40mm', 's4-dup'))
+    conn.execute('INSERT INTO "EquipmentItem" ("id", "name", "brand", "category") VALUES (?, ?, ?, ?)',
+                 ('new', 'Cooke Panchro/i 25mm', 'Cooke', 'LNS'))
+    conn.commit()
+    conn.close()
+    rows = CatalogIndex.cached(catalog, cache).query(CatalogQuery('LNS', search='cooke'))
+    assert [row['name'] for row in rows] == ['Cooke Panchro/i 25mm', 'Cooke S4/i 50mm', 'Cooke S4/i 40mm']
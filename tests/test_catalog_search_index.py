@@ -0,0 +1,133 @@
+import sqlite3
+
+import pytest
+
+from catalog_search_index import (
+    build_haystack,
+    matches_haystack,
+    normalize_catalog_search_text,
+    open_index,
+    search,
+    tokenize_catalog_search,
+    update_index,
+)
+
+COLUMNS = ('id', 'name', 'brand', 'model', 'category', 'subcategory', 'coverage',
+           'focal_length', 'aperture', 'description', 'updatedAt')
+
+ITEMS = [
+    {'id': 'thypoch-35', 'name': 'Thypoch Simera C 35mm T1.5', 'brand': 'Thypoch', 'model': 'Simera-C',
+     'category': 'LNS', 'subcategory': 'Prime', 'focal_length': '35mm', 'aperture': 'T1.5',
+     'description': 'Cine prime lens'},
+    {'id': 'cooke-s4-50', 'name': 'Cooke S4/i 50mm', 'brand': 'Cooke', 'model': 'S4/i', 'category': 'LNS'},
+    {'id': 'sigma-35', 'name': 'Sigma Cine 35mm T1.5', 'brand': 'Sigma', 'category': 'LNS', 'aperture': 'T1.5'},
+    {'id': 'cooke-panchro-32', 'name': 'Cooke Panchro/i Classic 32mm', 'brand': 'Cooke',
+     'model': 'Panchro/i FF', 'category': 'LNS', 'subcategory': 'Vintage', 'coverage': 'FF'},
+    {'id': 'optimo-24-290', 'name': 'Angénieux Optimo 24-290', 'brand': 'Angénieux', 'model': 'Optimo',
+     'category': 'LNS', 'subcategory': 'Zoom', 'aperture': 'T2.8'},
+    {'id': 'alexa-35', 'name': 'ARRI Alexa 35', 'brand': 'ARRI', 'model': 'Alexa 35', 'category': 'CAM',
+     'description': "Super 35 camera body"},
+    {'id': 'zeiss-sp-50', 'name': 'Zeiss Supreme Prime 50mm', 'brand': 'Zeiss', 'model': 'Supreme Prime',
+     'category': 'LNS', 'subcategory': 'Prime', 'coverage': 'FF', 'aperture': 'T1.5'},
+    {'id': 'sandisk-512', 'name': 'SanDisk CFexpress 512GB', 'brand': 'SanDisk', 'category': 'SUP',
+     'subcategory': 'Media'},
+]
+
+QUERIES = [
+    '', '   ', 'cine', 'cine primes', 'Simera-C T1.5 Cine Primes', 'Simera T1.5', 'Cooke S4i', 'S4/i',
+    'cooke', 'panchro/i', 't1.5', '35', '35mm', 'alexa 35', 'bodies', 'Angenieux', 'angénieux 24-290',
+    'optimo24', 'prime set', 'lenses', 'zz', 'a', 'supreme primes ff', "Cooke's", '512gb cfexpress',
+]
+
+
+def _matches(item, query):
+    return matches_haystack(build_haystack(item), query)
+
+
+def test_normalizes_punctuation_and_casing():
+    assert normalize_catalog_search_text('Simera-C T1.5 Cine Primes') == 'simera c t1.5 cine primes'
+
+
+def test_matches_lens_set_style_queries_against_individual_lens_metadata():
+    assert _matches(ITEMS[0], 'Simera-C T1.5 Cine Primes')
+
+
+def test_matches_compact_punctuation_variants():
+    assert _matches({'name': 'Cooke S4/i 50mm', 'brand': 'Cooke', 'model': 'S4/i', 'category': 'LNS'},
+                    'Cooke S4i')
+
+
+def test_keeps_generic_words_only_when_they_are_the_whole_query():
+    assert tokenize_catalog_search('cine primes') == ['cine', 'prime']
+    assert tokenize_catalog_search('Simera-C T1.5 Cine Primes') == ['simera', 't1.5']
+
+
+def test_does_not_match_when_a_meaningful_token_is_absent():
+    item = {'name': 'Sigma Cine 35mm T1.5', 'brand': 'Sigma', 'category': 'LNS', 'aperture': 'T1.5'}
+    assert not _matches(item, 'Simera T1.5')
+
+
+def _write_catalog(path, items):
+    conn = sqlite3.connect(path)
+    columns = ', '.join(f'"{c}" TEXT' for c in COLUMNS)
+    conn.execute(f'CREATE TABLE "EquipmentItem" ({columns})')
+    conn.executemany(
+        f'INSERT INTO "EquipmentItem" VALUES ({", ".join("?" for _ in COLUMNS)})',
+        ([item.get(c, '1700000000000' if c == 'updatedAt' else None) for c in COLUMNS] for item in items),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _linear_scan(catalog_path, query):
+    conn = sqlite3.connect(catalog_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute('SELECT * FROM "EquipmentItem" ORDER BY rowid').fetchall()
+        return [row['id'] for row in rows if matches_haystack(build_haystack(row), query)]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / 'catalog.db')
+    _write_catalog(path, ITEMS)
+    return path
+
+
+@pytest.fixture
+def index(catalog, tmp_path):
+    conn = open_index(catalog, str(tmp_path / 'index.sqlite'))
+    update_index(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_index_matches_linear_scan(catalog, index, query):
+    assert search(index, query) == _linear_scan(catalog, query)
+
+
+def test_incremental_update_follows_edits_and_deletes(catalog, index):
+    writer = sqlite3.connect(catalog)
+    writer.execute('UPDATE "EquipmentItem" SET "name" = ?, "updatedAt" = ? WHERE "id" = ?',
+                   ('Cooke S7/i 50mm', '1800000000000', 'cooke-s4-50'))
+    writer.execute('DELETE FROM "EquipmentItem" WHERE "id" = ?', ('sigma-35',))
+    writer.commit()
+    writer.close()
+
+    stats = update_index(index)
+    assert stats == {'scanned': 1, 'reindexed': 1, 'removed': 1}
+    for query in QUERIES + ['S7/i', 'sigma']:
+        assert search(index, query) == _linear_scan(catalog, query)
+
+
+def test_catalog_database_is_not_written(catalog, tmp_path):
+    with open(catalog, 'rb') as f:
+        before = f.read()
+    conn = open_index(catalog, str(tmp_path / 'other-index.sqlite'))
+    update_index(conn, rebuild=True)
+    conn.close()
+    with open(catalog, 'rb') as f:
+        assert f.read() == before
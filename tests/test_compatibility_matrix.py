@@ -0,0 +1,133 @@
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from catalog_db import connect
+from compatibility_matrix import (
+    COVERAGE_IMAGE_CIRCLE,
+    COVERAGE_LEVEL,
+    MOUNT_ADAPTER,
+    MOUNT_IMPOSSIBLE,
+    MOUNT_MASK,
+    MOUNT_NO_ADAPTER,
+    MOUNT_OK,
+    CompatibilityMatrix,
+    build,
+    parse_mount_tokens,
+)
+
+COLUMNS = ('id', 'name', 'category', 'subcategory', 'mount', 'coverage', 'specs_json',
+           'image_circle_mm', 'sensor_size', 'sensor_type')
+
+# Catalog versions of the tests/compatibility.test.ts cases. The matrix uses
+# each camera's catalog sensor size, so the cases that depend on a per-project
+# configJson (sensor mode, gate, aspect crop) are not ported.
+ITEMS = [
+    ('cam-pl', 'ARRI Alexa 35', 'CAM', 'Bodies', 'PL', None, None, None, 'FF', None),
+    ('cam-rf', 'RED V-Raptor', 'CAM', 'Bodies', 'RF', None, None, None, 'FF', None),
+    ('cam-lpl', 'ARRI Alexa Mini LF', 'CAM', 'Bodies', 'LPL', None, None, None, 'FF', None),
+    ('cam-ff', 'Sony Venice', 'CAM', 'Bodies', 'PL', None, None, None, 'Full Frame', None),
+    ('cam-multi', 'Multi-mount body', 'CAM', 'Bodies', 'DL / E / L / M / PL', None, None, None, 'Full Frame', None),
+    ('lens-e', 'Sony E Lens', 'LNS', 'Prime', 'E-Mount', 'FF', None, None, None, None),
+    ('lens-e-s35', 'Sony E S35 Lens', 'LNS', 'Prime', 'E-Mount', 'S35', None, None, None, None),
+    ('lens-pl', 'Cooke S4/i', 'LNS', 'Prime', 'PL', 'FF', None, None, None, None),
+    ('lens-m42', 'Helios 44', 'LNS', 'Prime', 'M42', 'FF', None, None, None, None),
+    ('lens-s35', 'Super 35 Prime', 'LNS', 'Prime', 'PL', 'S35', None, None, None, None),
+    ('lens-31', 'Small Circle Prime', 'LNS', 'Prime', 'PL', 'FF', None, 31, None, None),
+    ('lens-m', 'Leica M Prime', 'LNS', 'Prime', 'M-Mount', 'FF', json.dumps({'image_circle_mm': 43.2}), None,
+     None, None),
+]
+
+
+def create_catalog(path):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "EquipmentItem" ({})'.format(', '.join(f'"{c}"' for c in COLUMNS)))
+    conn.executemany(f'INSERT INTO "EquipmentItem" VALUES ({", ".join("?" * len(COLUMNS))})', ITEMS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def build_matrix(db, out, full=False):
+    conn = connect(db, readonly=True)
+    try:
+        return build(conn, out, full=full)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return create_catalog(str(tmp_path / 'catalog.db'))
+
+
+@pytest.fixture
+def matrix(catalog, tmp_path):
+    out = str(tmp_path / 'compat')
+    build_matrix(catalog, out)
+    return CompatibilityMatrix(out)
+
+
+def test_parses_mount_lists():
+    assert parse_mount_tokens('DL / E / L / M / PL') == ['DL', 'E-MOUNT', 'L-MOUNT', 'M-MOUNT', 'PL']
+    assert parse_mount_tokens('Sony E-Mount') == ['E-MOUNT']
+    assert parse_mount_tokens('PL / LPL') == ['PL', 'LPL']
+    assert parse_mount_tokens('E-Mount, E') == ['E-MOUNT']
+    assert parse_mount_tokens(None) == []
+
+
+def test_e_mount_lens_on_pl_camera_is_impossible(matrix):
+    assert matrix.lookup('lens-e', 'cam-pl') & MOUNT_MASK == MOUNT_IMPOSSIBLE
+
+
+def test_impossible_mounts_skip_the_coverage_checks(matrix):
+    assert matrix.lookup('lens-e-s35', 'cam-pl') == MOUNT_IMPOSSIBLE
+
+
+def test_known_adapter_path_needs_an_adapter(matrix):
+    assert matrix.lookup('lens-pl', 'cam-rf') == MOUNT_ADAPTER
+
+
+def test_no_known_adapter_is_a_hard_mismatch(matrix):
+    assert matrix.lookup('lens-m42', 'cam-lpl') == MOUNT_NO_ADAPTER
+
+
+def test_lens_coverage_below_the_sensor_may_vignette(matrix):
+    assert matrix.lookup('lens-s35', 'cam-ff') == MOUNT_OK | COVERAGE_LEVEL
+
+
+def test_image_circle_below_the_sensor_requirement(matrix):
+    assert matrix.lookup('lens-31', 'cam-ff') == MOUNT_OK | COVERAGE_IMAGE_CIRCLE
+
+
+def test_camera_supporting_one_of_several_mounts_is_ok(matrix):
+    assert matrix.lookup('lens-m', 'cam-multi') == MOUNT_OK
+    assert matrix.lookup('lens-pl', 'cam-pl') == MOUNT_OK
+
+
+def test_unknown_items_are_not_in_the_matrix(matrix):
+    assert matrix.lookup('missing', 'cam-pl') is None
+
+
+def test_incremental_rebuild_matches_a_full_rebuild(catalog, tmp_path):
+    out = str(tmp_path / 'compat')
+    build_matrix(catalog, out)
+    assert build_matrix(catalog, out)['camera_columns'] == 0
+
+    conn = sqlite3.connect(catalog)
+    conn.execute('UPDATE "EquipmentItem" SET "mount" = ? WHERE "id" = ?', ('E-Mount', 'cam-lpl'))
+    conn.commit()
+    conn.close()
+    stats = build_matrix(catalog, out)
+    assert (stats['lens_rows'], stats['camera_columns']) == (0, 1)
+
+    full = str(tmp_path / 'compat-full')
+    build_matrix(catalog, full, full=True)
+    incremental, rebuilt = CompatibilityMatrix(out), CompatibilityMatrix(full)
+    assert incremental.lens_pos == rebuilt.lens_pos
+    assert incremental.camera_pos == rebuilt.camera_pos
+    np.testing.assert_array_equal(incremental.matrix, rebuilt.matrix)
+    assert incremental.lookup('lens-e', 'cam-lpl') == MOUNT_OK
+    assert incremental.lookup('lens-pl', 'cam-lpl') == MOUNT_ADAPTER
@@ -0,0 +1,308 @@
+import os
+import stat
+
+import pytest
+
+import fix_inventory_panel
+from fix_inventory_panel import (
+    Patch,
+    PatchError,
+    PatchManifest,
+    _run_one,
+    apply_patch,
+    expand_targets,
+    main,
+    run_batch,
+)
+
+TARGET = (
+    "export function Panel({ items }) {\n"
+    "    return (\n"
+    "        <div>\n"
+    "            {items.map(item => {\n"
+    "                return <Row item={item} />;\n"
+    "            })}\n"
+    "        </div>\n"
+    "    );\n"
+    "}\n"
+)
+
+PATCHED = (
+    "export function Panel({ items }) {\n"
+    "    return (\n"
+    "        <div>\n"
+    "            {items.map(item => {\n"
+    "                const key = item.id;\n"
+    "                return <Row key={key} item={item} />;\n"
+    "            })}\n"
+    "        </div>\n"
+    "    );\n"
+    "}\n"
+)
+
+ROWS_PATCH = Patch(
+    name='rows',
+    start=r'^\s*\{items\.map\(item => \{\s*$',
+    end=r'^\s*\}\)\}\s*$',
+    replacement="""{items.map(item => {
+    const key = item.id;
+    return <Row key={key} item={item} />;
+})}""",
+)
+
+
+def write(path, text, newline='\n'):
+    with open(path, 'wb') as f:
+        f.write(text.replace('\n', newline).encode('utf-8'))
+    return str(path)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def leftovers(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.tmp'))
+
+
+def test_replaces_the_anchored_block_at_the_anchor_indent(tmp_path):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    result = apply_patch(path, ROWS_PATCH)
+    assert result.status == 'applied'
+    assert (result.start_line, result.end_line) == (4, 6)
+    assert read(path) == PATCHED.encode('utf-8')
+    assert leftovers(tmp_path) == []
+
+
+def test_nested_closer_with_deeper_indent_does_not_end_the_block(tmp_path):
+    nested = TARGET.replace(
+        "                return <Row item={item} />;\n",
+        "                {item.tags.map(tag => {\n"
+        "                    return tag;\n"
+        "                })}\n"
+        "                return <Row item={item} />;\n",
+    )
+    path = write(tmp_path / 'Panel.tsx', nested)
+    result = apply_patch(path, ROWS_PATCH)
+    assert (result.start_line, result.end_line) == (4, 9)
+    assert read(path) == PATCHED.encode('utf-8')
+
+
+def test_dry_run_reports_a_diff_and_writes_nothing(tmp_path):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    result = apply_patch(path, ROWS_PATCH, dry_run=True)
+    assert result.status == 'dry-run'
+    assert '@@ -2,7 +2,8 @@\n' in result.diff
+    assert '+                const key = item.id;\n' in result.diff
+    assert read(path) == TARGET.encode('utf-8')
+    assert leftovers(tmp_path) == []
+
+
+def test_target_without_the_start_anchor_is_left_alone(tmp_path):
+    path = write(tmp_path / 'Other.tsx', "export const x = 1;\n")
+    mtime = os.stat(path).st_mtime_ns
+    assert apply_patch(path, ROWS_PATCH).status == 'no-match'
+    assert os.stat(path).st_mtime_ns == mtime
+    assert leftovers(tmp_path) == []
+
+
+def test_missing_end_anchor_leaves_the_target_intact(tmp_path):
+    truncated = TARGET.replace("            })}\n", "")
+    path = write(tmp_path / 'Panel.tsx', truncated)
+    with pytest.raises(PatchError, match='end anchor'):
+        apply_patch(path, ROWS_PATCH)
+    assert read(path) == truncated.encode('utf-8')
+    assert leftovers(tmp_path) == []
+
+
+def test_duplicated_start_anchor_fails(tmp_path):
+    doubled = TARGET.replace("        </div>\n", "            {items.map(item => {\n        </div>\n")
+    path = write(tmp_path / 'Panel.tsx', doubled)
+    with pytest.raises(PatchError, match='matches again'):
+        apply_patch(path, ROWS_PATCH)
+    assert read(path) == doubled.encode('utf-8')
+    assert leftovers(tmp_path) == []
+
+
+def test_errors_are_reported_as_failed_results(tmp_path):
+    missing = str(tmp_path / 'missing.tsx')
+    result = _run_one(missing, 'catalog-filter', False)
+    assert result.status == 'failed'
+    assert result.error
+
+
+def test_crlf_targets_keep_crlf_line_endings(tmp_path):
+    path = write(tmp_path / 'Panel.tsx', TARGET, newline='\r\n')
+    assert apply_patch(path, ROWS_PATCH).status == 'applied'
+    data = read(path)
+    assert data == PATCHED.replace('\n', '\r\n').encode('utf-8')
+    assert b'\n' not in data.replace(b'\r\n', b'')
+
+
+def test_file_mode_is_preserved(tmp_path):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    os.chmod(path, 0o640)
+    apply_patch(path, ROWS_PATCH)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+@pytest.fixture
+def rows_patch(monkeypatch):
+    monkeypatch.setitem(fix_inventory_panel.PATCHES, ROWS_PATCH.name, ROWS_PATCH)
+    return ROWS_PATCH.name
+
+
+def batch(paths, patch_name, manifest_path, **kwargs):
+    state = PatchManifest.load(manifest_path)
+    results, _ = run_batch(paths, patch_name, jobs=1, state=state, **kwargs)
+    state.save()
+    return [result.status for result in results]
+
+
+def test_applying_twice_is_already_applied_and_leaves_bytes_alone(tmp_path):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    assert apply_patch(path, ROWS_PATCH).status == 'applied'
+    patched = read(path)
+    mtime = os.stat(path).st_mtime_ns
+    assert apply_patch(path, ROWS_PATCH).status == 'already-applied'
+    assert read(path) == patched
+    assert os.stat(path).st_mtime_ns == mtime
+    assert leftovers(tmp_path) == []
+
+
+def test_second_batch_run_is_up_to_date_from_the_manifest(tmp_path, rows_patch):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    manifest = str(tmp_path / 'manifest.json')
+    assert batch([path], rows_patch, manifest) == ['applied']
+    patched = read(path)
+    assert batch([path], rows_patch, manifest) == ['up-to-date']
+    assert batch([path], rows_patch, manifest, force=True) == ['already-applied']
+    assert read(path) == patched
+
+
+def test_changed_mtime_forces_a_rescan(tmp_path, rows_patch):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    manifest = str(tmp_path / 'manifest.json')
+    batch([path], rows_patch, manifest)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert PatchManifest.load(manifest).lookup(path, ROWS_PATCH) is None
+    assert batch([path], rows_patch, manifest) == ['already-applied']
+    assert batch([path], rows_patch, manifest) == ['up-to-date']
+
+
+def test_reverted_content_is_patched_again(tmp_path, rows_patch):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    manifest = str(tmp_path / 'manifest.json')
+    batch([path], rows_patch, manifest)
+    write(path, TARGET + "// reverted\n")
+    assert batch([path], rows_patch, manifest) == ['applied']
+    assert read(path) == (PATCHED + "// reverted\n").encode('utf-8')
+
+
+def test_changed_patch_invalidates_the_manifest(tmp_path, rows_patch, monkeypatch):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    manifest = str(tmp_path / 'manifest.json')
+    batch([path], rows_patch, manifest)
+    changed = Patch(ROWS_PATCH.name, ROWS_PATCH.start, ROWS_PATCH.end,
+                    ROWS_PATCH.replacement.replace('const key', 'let key'))
+    monkeypatch.setitem(fix_inventory_panel.PATCHES, rows_patch, changed)
+    assert batch([path], rows_patch, manifest) == ['applied']
+
+
+def test_failures_are_not_recorded(tmp_path, rows_patch):
+    truncated = TARGET.replace("            })}\n", "")
+    path = write(tmp_path / 'Panel.tsx', truncated)
+    manifest = str(tmp_path / 'manifest.json')
+    assert batch([path], rows_patch, manifest) == ['failed']
+    assert batch([path], rows_patch, manifest) == ['failed']
+    assert read(path) == truncated.encode('utf-8')
+    assert leftovers(tmp_path) == []
+
+
+def test_dry_runs_are_not_recorded(tmp_path, rows_patch):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    manifest = str(tmp_path / 'manifest.json')
+    assert batch([path], rows_patch, manifest, dry_run=True) == ['dry-run']
+    assert batch([path], rows_patch, manifest) == ['applied']
+
+
+def test_crlf_target_is_up_to_date_after_patching(tmp_path, rows_patch):
+    path = write(tmp_path / 'Panel.tsx', TARGET, newline='\r\n')
+    manifest = str(tmp_path / 'manifest.json')
+    assert batch([path], rows_patch, manifest) == ['applied']
+    assert batch([path], rows_patch, manifest, force=True) == ['already-applied']
+    assert read(path) == PATCHED.replace('\n', '\r\n').encode('utf-8')
+
+
+BATCH = {
+    'd-panel.tsx': TARGET,
+    'a-patched.tsx': PATCHED,
+    'c-other.tsx': "export const x = 1;\n",
+    'b-truncated.tsx': TARGET.replace("            })}\n", ""),
+    'e-crlf.tsx': TARGET.replace('\n', '\r\n'),
+    'f-panel.tsx': TARGET + "// second copy\n",
+}
+
+
+def batch_dir(directory):
+    directory.mkdir()
+    paths = [write(directory / name, text) for name, text in BATCH.items()]
+    return paths + [str(directory / 'missing.tsx')]
+
+
+def test_parallel_batch_matches_serial_in_target_order(tmp_path, rows_patch):
+    outcomes = []
+    for jobs in (1, 2):
+        directory = tmp_path / f'jobs-{jobs}'
+        results, _ = run_batch(batch_dir(directory), rows_patch, jobs=jobs)
+        outcomes.append((
+            [(os.path.basename(r.path), r.status, r.start_line, r.end_line, bool(r.error)) for r in results],
+            {name: read(directory / name) for name in BATCH},
+        ))
+        assert leftovers(directory) == []
+    assert outcomes[0] == outcomes[1]
+    assert [row[:2] for row in outcomes[0][0]] == [
+        ('d-panel.tsx', 'applied'), ('a-patched.tsx', 'already-applied'), ('c-other.tsx', 'no-match'),
+        ('b-truncated.tsx', 'failed'), ('e-crlf.tsx', 'applied'), ('f-panel.tsx', 'applied'),
+        ('missing.tsx', 'failed'),
+    ]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ('components/Panel.tsx', 'components/ui/Card.tsx', 'components/notes.txt', 'app/Page.tsx'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write(path, TARGET)
+    (tmp_path / 'lists').mkdir()
+    return tmp_path
+
+
+def test_expand_targets_resolves_globs_and_manifest_entries(tree):
+    manifest = tree / 'lists' / 'targets.txt'
+    manifest.write_text("# InventoryPanel copies\n\n../components/**/*.tsx\n  ../missing.tsx  \n",
+                        encoding='utf-8')
+    targets = expand_targets([str(tree / 'app' / '*.tsx'), str(tree / 'components' / 'Panel.tsx')], str(manifest))
+    assert targets == sorted(str(tree / name) for name in (
+        'app/Page.tsx', 'components/Panel.tsx', 'components/ui/Card.tsx', 'missing.tsx'))
+
+
+def test_unmatched_globs_expand_to_nothing(tree):
+    assert expand_targets([str(tree / 'nowhere' / '*.tsx')]) == []
+
+
+def test_main_patches_manifest_targets_in_parallel(tree, rows_patch, capsys):
+    manifest = tree / 'lists' / 'targets.txt'
+    manifest.write_text("../components/**/*.tsx\n../app/Page.tsx\n", encoding='utf-8')
+    argv = ['--manifest', str(manifest), '--patch', rows_patch, '--jobs', '2',
+            '--state', str(tree / 'state.json'), '--no-snapshot']
+    assert main(argv) == 0
+    assert '3 targets' in capsys.readouterr().out
+    for name in ('app/Page.tsx', 'components/Panel.tsx', 'components/ui/Card.tsx'):
+        assert read(tree / name) == PATCHED.encode('utf-8')
+    assert read(tree / 'components' / 'notes.txt') == TARGET.encode('utf-8')
+    assert main(argv) == 0
+    assert '3 up-to-date' in capsys.readouterr().out
+    assert leftovers(tree / 'components') == []
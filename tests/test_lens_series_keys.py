@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+import lens_series_keys
+from catalog_db import open_sidecar
+from lens_series_keys import TABLE, lib_series_name, panel_series_name, refresh
+
+ITEMS = [
+    ('simera-21', 'LNS', 'Thypoch Simera-C 21mm T1.5', 'Thypoch', 'Simera-C 21mm T1.5'),
+    ('simera-75', 'LNS', 'Thypoch Simera-C 75mm T1.5', 'Thypoch', 'Simera-C 75mm T1.5'),
+    ('s4-50', 'LNS', 'S4/i 50mm T2', 'Cooke', 'S4/i'),
+    ('nd-set', 'SUP', 'Tiffen ND Set 4x5.65"', 'Tiffen', 'ND Set'),
+    ('alexa', 'CAM', 'ARRI Alexa 35', 'ARRI', 'Alexa 35'),
+]
+
+
+def test_lib_series_groups_variants_by_series_instead_of_focal_length():
+    assert lib_series_name('Thypoch Simera-C 21mm T1.5', 'Thypoch', 'Simera-C 21mm T1.5') == 'Simera-C T1.5'
+    assert lib_series_name('Thypoch Simera-C 75mm T1.5', 'Thypoch', 'Simera-C 75mm T1.5') == 'Simera-C T1.5'
+
+
+def test_lib_series_falls_back_to_name_and_default():
+    assert lib_series_name('Cooke S4/i 50mm', 'Cooke', None) == 'S4/i'
+    assert lib_series_name('50mm', None, None) == '50mm'
+    assert lib_series_name(None, None, None) == 'Lens Set'
+
+
+def test_panel_series_prefixes_brand_and_strips_focal_length_and_stops():
+    assert panel_series_name('LNS', 'S4/i 50mm T2', 'Cooke', 'S4/i') == 'Cooke S4/i'
+    assert panel_series_name('LNS', 'Thypoch Simera-C 35mm T1.5', 'Thypoch', None) == 'Thypoch Simera-C'
+    assert panel_series_name('LNS', 'Canon 24-70mm F2.8', 'Canon', None) == 'Canon 24-70mm'
+
+
+def test_panel_series_uses_model_or_name_outside_lenses():
+    assert panel_series_name('SUP', 'Tiffen ND Set', 'Tiffen', 'ND Set') == 'ND Set'
+    assert panel_series_name('SUP', 'Tiffen ND Set', 'Tiffen', None) == 'Tiffen ND Set'
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / 'catalog.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "EquipmentItem" ("id" TEXT PRIMARY KEY, "category" TEXT, "name" TEXT, '
+                 '"brand" TEXT, "model" TEXT)')
+    conn.executemany('INSERT INTO "EquipmentItem" VALUES (?, ?, ?, ?, ?)', ITEMS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def keys(catalog, tmp_path):
+    conn = open_sidecar(catalog, str(tmp_path / 'keys.sqlite'))
+    yield conn
+    conn.close()
+
+
+def edit(catalog, sql, *params):
+    conn = sqlite3.connect(catalog)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def stored(conn):
+    return {row['item_id']: (row['panel_key'], row['lib_key'])
+            for row in conn.execute(f'SELECT * FROM "{TABLE}"')}
+
+
+def test_refresh_stores_keys_for_lenses_and_support(keys):
+    assert refresh(keys) == {'recomputed': 4, 'removed': 0, 'total': 4}
+    assert stored(keys) == {
+        'simera-21': ('Thypoch-Thypoch Simera-C', 'Thypoch-Simera-C T1.5'),
+        'simera-75': ('Thypoch-Thypoch Simera-C', 'Thypoch-Simera-C T1.5'),
+        's4-50': ('Cooke-Cooke S4/i', 'Cooke-S4/i'),
+        'nd-set': ('Tiffen-ND Set', None),
+    }
+
+
+def test_refresh_only_recomputes_edited_rows(catalog, keys):
+    refresh(keys)
+    assert refresh(keys)['recomputed'] == 0
+
+    edit(catalog, 'UPDATE "EquipmentItem" SET "model" = ? WHERE "id" = ?', 'Simera-C 21mm T2', 'simera-21')
+    edit(catalog, 'DELETE FROM "EquipmentItem" WHERE "id" = ?', 'nd-set')
+    edit(catalog, 'UPDATE "EquipmentItem" SET "category" = ? WHERE "id" = ?', 'LNS', 'alexa')
+    assert refresh(keys) == {'recomputed': 2, 'removed': 1, 'total': 4}
+    assert stored(keys)['simera-21'][1] == 'Thypoch-Simera-C T2'
+    assert stored(keys)['alexa'] == ('ARRI-ARRI Alexa 35', 'ARRI-Alexa 35')
+
+
+def test_a_new_key_version_recomputes_everything(keys, monkeypatch):
+    refresh(keys)
+    monkeypatch.setattr(lens_series_keys, 'KEY_VERSION', lens_series_keys.KEY_VERSION + 1)
+    assert refresh(keys)['recomputed'] == 4
+    assert refresh(keys)['recomputed'] == 0
+
+
+def test_catalog_database_is_not_written(catalog, keys):
+    with open(catalog, 'rb') as f:
+        before = f.read()
+    refresh(keys)
+    with open(catalog, 'rb') as f:
+        assert f.read() == before
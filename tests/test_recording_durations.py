@@ -0,0 +1,122 @@
+import json
+import sqlite3
+
+import pytest
+
+from catalog_db import open_sidecar
+from recording_durations import (
+    SETUPS_TABLE,
+    duration_grid,
+    format_capacity,
+    format_duration,
+    main,
+    parse_media_capacity_gb,
+    parse_recording_formats,
+    query,
+    refresh,
+    resolve_config,
+)
+
+ALEXA_FORMATS = json.dumps([
+    {'resolution': '4.6K Open Gate', 'codec': 'ARRIRAW', 'data_rate': '2.6 Gbps'},
+    {'resolution': '4K 16:9', 'codec': 'ProRes 422 HQ', 'data_rate': '800 Mbps'},
+])
+
+ITEMS = [
+    ('alexa', 'ARRI Alexa 35', 'Alexa 35', 'CAM', None, ALEXA_FORMATS, None),
+    ('codex', 'Codex Drive 1TB', 'Compact Drive', 'SUP', 'Recording Media', None, None),
+    ('cfexpress', 'CFexpress Type B 512GB', None, 'SUP', 'Memory Card', None, None),
+    ('scorecard', 'Scorecard Slate 1TB', None, 'SUP', 'scorecard', None, None),
+    ('lower', 'Generic SSD 2TB', None, 'SUP', 'media', None, None),
+]
+
+
+def minutes(config, formats=None, capacity_gb=1000):
+    rate, source = resolve_config(parse_recording_formats(formats), config)
+    return rate, source, float(duration_grid([('camera', '', source, rate)], [('media', capacity_gb)])[0, 0])
+
+
+def test_reads_media_capacity_from_names_and_specs():
+    assert parse_media_capacity_gb('Codex Drive 1TB') == 1000
+    assert parse_media_capacity_gb('CFexpress Type B 512GB') == 512
+    assert parse_media_capacity_gb('Codex Drive', 'Compact Drive', json.dumps({'capacity_tb': 2})) == 2000
+
+
+def test_estimates_from_the_setup_when_the_catalog_has_no_rate():
+    rate, source, value = minutes({'resolutionK': '4.6K', 'gateMode': 'Open Gate',
+                                   'aspectRatio': '16:9', 'codec': 'ARRIRAW'})
+    assert (rate, source) == (2600, 'estimate')
+    assert round(value) == 51
+    assert f"{format_capacity(1000)} -> {format_duration(value)}" == '1TB -> 51 min'
+
+
+def test_prefers_a_matching_catalog_rate():
+    rate, source, value = minutes({'resolutionK': '4K', 'gateMode': '16:9', 'aspectRatio': '16:9',
+                                   'codec': 'ProRes 422 HQ'}, ALEXA_FORMATS)
+    assert (rate, source) == (800, 'catalog')
+    assert value == pytest.approx(166.67, abs=0.01)
+    assert format_duration(value) == '2h 47m'
+
+
+def test_verified_profile_rate_is_labelled_verified():
+    rate, source, value = minutes({'profileId': 'profile-0-alexa-35-arriraw', 'source': 'verified',
+                                   'resolutionK': '4.6K', 'gateMode': 'Open Gate', 'codec': 'ARRIRAW',
+                                   'dataRateMbps': 2600})
+    assert (rate, source) == (2600, 'verified')
+    assert round(value) == 51
+
+
+def test_custom_rate_for_generic_setups():
+    rate, source, value = minutes({'resolutionK': '8K', 'codec': 'ProRes 422 HQ', 'dataRateMbps': 1000})
+    assert (rate, source) == (1000, 'custom')
+    assert format_duration(value) == '2h 13m'
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / 'catalog.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "EquipmentItem" ("id" TEXT PRIMARY KEY, "name" TEXT, "model" TEXT, '
+                 '"category" TEXT, "subcategory" TEXT, "recordingFormats" TEXT, "specs_json" TEXT)')
+    conn.execute('CREATE TABLE "KitItem" ("id" TEXT PRIMARY KEY, "equipmentId" TEXT, "configJson" TEXT)')
+    conn.executemany('INSERT INTO "EquipmentItem" VALUES (?, ?, ?, ?, ?, ?, ?)', ITEMS)
+    conn.execute('INSERT INTO "KitItem" VALUES (?, ?, ?)',
+                 ('kit', 'alexa', json.dumps({'codec': 'ARRIRAW', 'resolutionK': '4.6K', 'dataRateMbps': 2000})))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def grid(catalog, tmp_path):
+    conn = open_sidecar(catalog, str(tmp_path / 'durations.sqlite'))
+    yield conn
+    conn.close()
+
+
+def test_grid_covers_catalog_and_kit_setups_on_media_and_card_items(catalog, grid):
+    with open(catalog, 'rb') as f:
+        before = f.read()
+    assert refresh(grid) == {'setups': 3, 'media': 2, 'cells': 6}
+    rows = query(grid, media='Codex')
+    assert [(row['source'], row['data_rate_mbps'], round(row['minutes'], 2)) for row in rows] == [
+        ('catalog', 2600, 51.28), ('catalog', 800, 166.67), ('custom', 2000, 66.67)]
+    with open(catalog, 'rb') as f:
+        assert f.read() == before
+
+
+def test_media_subcategory_match_is_case_sensitive(grid):
+    refresh(grid)
+    assert {row['media'] for row in query(grid)} == {'Codex Drive 1TB', 'CFexpress Type B 512GB'}
+
+
+def test_config_setups_are_not_cached(catalog, tmp_path, capsys):
+    cache = str(tmp_path / 'durations.sqlite')
+    config = json.dumps({'codec': 'ProRes 422 HQ', 'resolutionK': '4K'})
+    assert main(['--db', catalog, '--cache', cache, '--config', config, '--format', 'json']) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert len(rows) == 8
+    assert rows[-1]['label'] == '4K / ProRes 422 HQ'
+    conn = sqlite3.connect(cache)
+    assert conn.execute(f'SELECT COUNT(*) FROM "{SETUPS_TABLE}"').fetchone() == (3,)
+    conn.close()
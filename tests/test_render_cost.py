@@ -0,0 +1,94 @@
+import pytest
+
+import fix_inventory_panel
+from fix_inventory_panel import Patch, run_batch
+from render_cost import analyze_source, cost_delta, format_report
+from test_fix_inventory_panel import PATCHED, ROWS_PATCH, TARGET, leftovers, read, write
+
+PANEL = """export function Panel({ catalog }) {
+    const vintage = catalog.map(item => /K35|Baltar|Panchro/.test(item.name));
+    return (
+        <div>
+            {CATEGORIES.map(cat => {
+                const rows = catalog.filter(i => i.category === cat.id).sort((a, b) => {
+                    return a.brand.toLowerCase().localeCompare(b.brand.toLowerCase());
+                });
+                return <List key={cat.id} rows={rows} />;
+            })}
+        </div>
+    );
+}
+"""
+
+MEMOIZED = PANEL.replace(
+    "    const vintage",
+    "    const sorted = useMemo(() => catalog.slice().sort((a, b) => a.brand.localeCompare(b.brand)), [catalog]);\n"
+    "    const vintage",
+)
+
+RELATED_PATCH = Patch(
+    name='related',
+    start=ROWS_PATCH.start,
+    end=ROWS_PATCH.end,
+    replacement="""{items.map(item => {
+    const related = items.filter(other => other.brand.toLowerCase() === item.brand.toLowerCase());
+    return <Row item={item} related={related} />;
+})}""",
+)
+
+
+def test_sort_comparator_inside_a_category_loop_outranks_a_regex_map():
+    findings = analyze_source(PANEL, name='Panel.tsx')['findings']
+    comparator = [f for f in findings if f['line'] in (6, 7)
+                  and f['op'] in ('sort', 'lowercase', 'locale-compare')]
+    assert len(comparator) == 4
+    assert {f['complexity'] for f in comparator} == {'K·N·logN'}
+    assert findings[:4] == sorted(comparator, key=lambda f: (-f['cost']['10000'], f['line']))
+    regex = next(f for f in findings if f['op'] == 'regex')
+    assert (regex['line'], regex['complexity']) == (2, 'N')
+    assert findings.index(regex) == 4
+
+
+def test_costs_scale_with_catalog_size_and_rank_in_the_report():
+    report = analyze_source(PANEL, sizes=(100, 10000), name='Panel.tsx')
+    assert report['per_render']['10000'] > 100 * report['per_render']['100']
+    lines = format_report(report).splitlines()
+    assert lines[0].startswith('Panel.tsx: per-render cost')
+    assert 'locale-compare' in lines[4] and 'K·N·logN' in lines[4]
+
+
+def test_memoized_work_is_reported_separately():
+    report = analyze_source(MEMOIZED)
+    assert report['per_render'] == analyze_source(PANEL)['per_render']
+    assert all(value > 0 for value in report['memoized'].values())
+
+
+def test_cost_delta_compares_two_versions():
+    delta = cost_delta(TARGET, PANEL, sizes=(100, 1000))
+    assert set(delta) == {'100', '1000'}
+    assert all(row['delta'] == row['new'] - row['old'] > 0 for row in delta.values())
+
+
+@pytest.fixture
+def patches(monkeypatch):
+    monkeypatch.setitem(fix_inventory_panel.PATCHES, ROWS_PATCH.name, ROWS_PATCH)
+    monkeypatch.setitem(fix_inventory_panel.PATCHES, RELATED_PATCH.name, RELATED_PATCH)
+
+
+def test_batch_refuses_a_patch_over_the_cost_limit(tmp_path, patches):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    mtime = tmp_path.joinpath('Panel.tsx').stat().st_mtime_ns
+    results, _ = run_batch([path], RELATED_PATCH.name, jobs=1, cost_sizes=[100, 1000], max_cost_increase=10)
+    assert [result.status for result in results] == ['cost-regression']
+    assert 'limit 10%' in results[0].error
+    assert results[0].render_cost['1000']['delta'] > 0
+    assert read(path) == TARGET.encode('utf-8')
+    assert tmp_path.joinpath('Panel.tsx').stat().st_mtime_ns == mtime
+    assert leftovers(tmp_path) == []
+
+
+def test_batch_applies_a_patch_within_the_cost_limit(tmp_path, patches):
+    path = write(tmp_path / 'Panel.tsx', TARGET)
+    results, _ = run_batch([path], ROWS_PATCH.name, jobs=1, cost_sizes=[100, 1000], max_cost_increase=10)
+    assert [result.status for result in results] == ['applied']
+    assert read(path) == PATCHED.encode('utf-8')
@@ -0,0 +1,154 @@
+import json
+import os
+import stat
+
+import pytest
+
+import fix_inventory_panel
+from snapshot_store import MAX_CHUNK, SnapshotError, SnapshotStore, chunk
+from test_fix_inventory_panel import PATCHED, ROWS_PATCH, TARGET
+
+TEXT = ''.join(f"    <Row key={{{n}}} label=\"item {n}\" />\n" for n in range(4000)).encode('utf-8')
+BINARY = bytes(range(256)) * 64
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    base = tmp_path / 'repo'
+    return {
+        'base': str(base),
+        'text': write(str(base / 'components' / 'Panel.tsx'), TEXT),
+        'binary': write(str(base / 'prisma' / 'dev.db'), BINARY),
+    }
+
+
+@pytest.fixture
+def store(tmp_path, tree):
+    return SnapshotStore(str(tmp_path / 'store'), base=tree['base'])
+
+
+def test_chunks_reassemble_to_the_input():
+    assert b''.join(chunk(TEXT)) == TEXT
+    assert b''.join(chunk(BINARY)) == BINARY
+    assert len(chunk(TEXT)) > 1
+    assert {len(part) for part in chunk(BINARY)} == {4096}
+
+
+def test_long_lines_are_split_at_the_chunk_limit():
+    minified = b'const a=1;' * 20000 + b'\n' + TEXT + b'x' * (MAX_CHUNK + 10)
+    chunks = chunk(minified)
+    assert b''.join(chunks) == minified
+    assert max(len(part) for part in chunks) == MAX_CHUNK
+    assert chunks[:3] == [minified[:MAX_CHUNK], minified[MAX_CHUNK:2 * MAX_CHUNK],
+                          minified[2 * MAX_CHUNK:3 * MAX_CHUNK]]
+
+
+def test_snapshot_restore_round_trip(store, tree):
+    os.chmod(tree['text'], 0o640)
+    snapshot = store.snapshot([tree['text'], tree['binary']], label='before')
+    assert set(snapshot.files) == {'components/Panel.tsx', 'prisma/dev.db'}
+
+    write(tree['text'], TEXT.replace(b'item 7', b'item seven'))
+    os.unlink(tree['binary'])
+    assert store.restore(snapshot.id) == {'components/Panel.tsx': 'restored', 'prisma/dev.db': 'restored'}
+    assert read(tree['text']) == TEXT
+    assert read(tree['binary']) == BINARY
+    assert stat.S_IMODE(os.stat(tree['text']).st_mode) == 0o640
+    assert store.restore(snapshot.id) == {'components/Panel.tsx': 'unchanged', 'prisma/dev.db': 'unchanged'}
+
+
+def test_edits_only_store_the_changed_chunks(store, tree):
+    store.snapshot([tree['text']])
+    objects, _ = store.disk_usage()
+    write(tree['text'], TEXT.replace(b'item 2000', b'item two thousand'))
+    store.snapshot([tree['text']])
+    assert 1 <= store.disk_usage()[0] - objects <= 2
+
+
+def test_restore_to_another_directory_and_by_prefix(store, tree, tmp_path):
+    snapshot = store.snapshot([tree['text']])
+    dest = str(tmp_path / 'elsewhere')
+    assert store.restore(snapshot.id[:6], ['components/Panel.tsx'], dest=dest) == {
+        'components/Panel.tsx': 'restored'}
+    assert read(os.path.join(dest, 'components', 'Panel.tsx')) == TEXT
+    assert read(tree['text']) == TEXT
+
+
+def test_restore_uses_the_base_the_snapshot_was_taken_with(store, tree, tmp_path):
+    snapshot = store.snapshot([tree['text']])
+    write(tree['text'], b'edited\n')
+    other = SnapshotStore(store.root, base=str(tmp_path / 'other'))
+    assert other.resolve(snapshot.id).base == tree['base']
+    assert other.restore(snapshot.id, [tree['text']]) == {'components/Panel.tsx': 'restored'}
+    assert read(tree['text']) == TEXT
+    assert not os.path.exists(tmp_path / 'other')
+
+
+def test_snapshots_without_a_recorded_base_restore_under_the_store_base(store, tree):
+    snapshot = store.snapshot([tree['text']])
+    manifest = os.path.join(store.snapshots_dir, f"{snapshot.id}.json")
+    with open(manifest, encoding='utf-8') as f:
+        body = json.load(f)
+    del body['base']
+    write(manifest, json.dumps(body).encode('utf-8'))
+    os.unlink(tree['text'])
+    assert store.resolve(snapshot.id).base is None
+    assert store.restore(snapshot.id) == {'components/Panel.tsx': 'restored'}
+    assert read(tree['text']) == TEXT
+
+
+def test_snapshot_recorded_under_another_name(store, tree, tmp_path):
+    backup = write(str(tmp_path / 'repo' / 'components' / 'Panel.tsx.bak'), b'old panel\n')
+    snapshot = store.snapshot([backup], names={backup: 'components/Panel.tsx'})
+    store.restore(snapshot.id)
+    assert read(tree['text']) == b'old panel\n'
+
+
+def test_unknown_snapshots_and_files_are_errors(store, tree):
+    snapshot = store.snapshot([tree['text']])
+    with pytest.raises(SnapshotError):
+        store.restore('ffffffffffff')
+    with pytest.raises(SnapshotError, match='not in snapshot'):
+        store.restore(snapshot.id, ['prisma/dev.db'])
+
+
+def test_corrupt_objects_are_detected(store, tree):
+    snapshot = store.snapshot([tree['binary']])
+    digest = snapshot.files['prisma/dev.db']['chunks'][0]
+    write(store._object_path(digest), b'not zlib')
+    os.unlink(tree['binary'])
+    with pytest.raises(SnapshotError, match='corrupt'):
+        store.restore(snapshot.id)
+    assert not os.path.exists(tree['binary'])
+
+
+def test_drop_and_gc_free_unreferenced_objects(store, tree):
+    first = store.snapshot([tree['binary']])
+    write(tree['binary'], BINARY[::-1])
+    store.snapshot([tree['binary']])
+    store.drop(first.id)
+    removed, freed = store.gc()
+    assert removed > 0 and freed > 0
+    assert store.restore('latest') == {'prisma/dev.db': 'unchanged'}
+
+
+def test_patch_batch_snapshots_targets_before_writing(store, tree, monkeypatch):
+    monkeypatch.setitem(fix_inventory_panel.PATCHES, ROWS_PATCH.name, ROWS_PATCH)
+    write(tree['text'], TARGET.encode('utf-8'))
+    results, snapshot = fix_inventory_panel.run_batch([tree['text']], ROWS_PATCH.name, jobs=1, store=store)
+    assert [result.status for result in results] == ['applied']
+    assert read(tree['text']) == PATCHED.encode('utf-8')
+    assert store.restore(snapshot.id) == {'components/Panel.tsx': 'restored'}
+    assert read(tree['text']) == TARGET.encode('utf-8')